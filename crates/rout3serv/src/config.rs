@@ -1,5 +1,6 @@
 use std::collections::HashMap;
 use std::ops::Deref;
+use std::path::PathBuf;
 
 use serde::Deserialize;
 use tonic::Status;
@@ -72,6 +73,13 @@ pub struct ServerConfig {
 
     #[serde(default)]
     pub routing_modes: HashMap<String, RoutingMode>,
+
+    /// directory to exchange Arrow IPC chunks with clients running on the same host.
+    ///
+    /// Should be located on a tmpfs like `/dev/shm`. Unset by default. The directory gets
+    /// created on startup and is only used for clients connecting via the loopback interface.
+    /// Files not picked up by clients get removed after an hour.
+    pub shared_memory_dir: Option<PathBuf>,
 }
 
 impl ServerConfig {
@@ -24,7 +24,7 @@ use crate::grpc::api::generated::{
 };
 use crate::grpc::error::{logged_status, StatusCodeAndMessage, ToStatusResult};
 use crate::grpc::geometry::{buffer_meters, from_wkb, geom_to_h3};
-use crate::grpc::util::{change_cell_resolution_dedup, StrId};
+use crate::grpc::util::{change_cell_resolution_dedup, valid_cells_at_resolution, StrId};
 use crate::grpc::ServerImpl;
 use crate::io::dataframe::CellDataFrame;
 use crate::io::memory_cache::FetchError;
@@ -136,7 +136,11 @@ pub(crate) async fn collect_input(
     Ok(DspInput {
         disturbance,
         within_buffer,
-        destinations: destination_cells(request.destinations, graph.h3_resolution())?,
+        destinations: destination_cells(
+            request.destinations,
+            request.destination_cells,
+            graph.h3_resolution(),
+        )?,
         store_output: request.store_output,
         options: request.options.unwrap_or_default(),
         graph,
@@ -149,6 +153,7 @@ pub(crate) async fn collect_input(
 /// cells to route to
 fn destination_cells(
     destinations: Vec<super::api::generated::Point>,
+    destination_h3indexes: Vec<u64>,
     h3_resolution: Resolution,
 ) -> Result<Vec<CellIndex>, Status> {
     let mut destination_cells = destinations
@@ -158,6 +163,10 @@ fn destination_cells(
         .to_status_result_with_message(Code::Internal, || {
             "can not convert the target points to h3".to_string()
         })?;
+    destination_cells.extend(valid_cells_at_resolution(
+        &destination_h3indexes,
+        h3_resolution,
+    ));
     destination_cells.sort_unstable();
     destination_cells.dedup();
     Ok(destination_cells)
@@ -442,3 +451,43 @@ pub fn build_routes_response(
     };
     Ok(response)
 }
+
+#[cfg(test)]
+mod tests {
+    use h3o::{CellIndex, LatLng, Resolution};
+
+    use super::destination_cells;
+    use crate::grpc::api::generated::Point;
+
+    #[test]
+    fn destination_cells_from_h3indexes_only() {
+        let cell = LatLng::new(52.52, 13.4).unwrap().to_cell(Resolution::Ten);
+        let parent = cell.parent(Resolution::Eight).unwrap();
+
+        let cells = destination_cells(
+            vec![],
+            vec![u64::from(cell), u64::from(parent), 0, u64::from(cell)],
+            Resolution::Eight,
+        )
+        .unwrap();
+
+        assert_eq!(cells, vec![parent]);
+    }
+
+    #[test]
+    fn destination_cells_from_points_and_h3indexes() {
+        let point_cell = LatLng::new(52.52, 13.4).unwrap().to_cell(Resolution::Eight);
+        let index_cell = LatLng::new(48.85, 2.35).unwrap().to_cell(Resolution::Eight);
+
+        let cells = destination_cells(
+            vec![Point { x: 13.4, y: 52.52 }],
+            vec![u64::from(index_cell), u64::from(point_cell), 0],
+            Resolution::Eight,
+        )
+        .unwrap();
+
+        let mut expected: Vec<CellIndex> = vec![point_cell, index_cell];
+        expected.sort_unstable();
+        assert_eq!(cells, expected);
+    }
+}
@@ -70,6 +70,7 @@ macro_rules! error_status_code_impl {
 error_status_code_impl!(tokio::task::JoinError);
 //error_status_code_impl!(anyhow::Error);
 error_status_code_impl!(polars_core::error::PolarsError);
+error_status_code_impl!(std::io::Error);
 
 macro_rules! logged_status {
     ($msg:expr, $code: expr, $lvl:expr, $caused_by:expr) => {{
@@ -16,7 +16,6 @@ use tonic::{Code, Request, Response, Status};
 use tower_http::trace::TraceLayer;
 use tracing::{info, warn, Level};
 
-use hexigraph::algorithm::resolution::transform_resolution;
 use hexigraph::container::{CellSet, HashSet};
 use hexigraph::graph::PreparedH3EdgeGraph;
 
@@ -24,14 +23,18 @@ use crate::config::ServerConfig;
 use crate::grpc::api::generated::rout3_serv_server::{Rout3Serv, Rout3ServServer};
 use crate::grpc::api::generated::{
     CellSelection, DifferentialShortestPathRequest, DifferentialShortestPathRoutes,
-    DifferentialShortestPathRoutesRequest, Empty, GraphHandle, H3ShortestPathRequest,
-    H3WithinThresholdRequest, IdRef, ListDatasetsResponse, ListGraphsResponse, RouteH3Indexes,
-    RouteWkb, VersionResponse,
+    DifferentialShortestPathRoutesRequest, Empty, GraphHandle, H3ShortestPathBatchChunk,
+    H3ShortestPathBatchRequest, H3ShortestPathRequest, H3WithinThresholdRequest, IdRef,
+    ListDatasetsResponse, ListGraphsResponse, RouteH3Indexes, RouteWkb, VersionResponse,
 };
 use crate::grpc::api::RouteH3IndexesKind;
 use crate::grpc::error::ToStatusResult;
 use crate::grpc::error::{logged_status, StatusCodeAndMessage};
-use crate::grpc::util::{spawn_blocking_status, stream_dataframe, ArrowIpcChunkStream};
+use crate::grpc::util::{
+    is_loopback, reject_legacy_cells, spawn_blocking_status, stream_dataframe,
+    sweep_shared_memory_dir, valid_cells_at_resolution, ArrowIpcChunkStream, ChunkSink,
+    SHARED_MEMORY_METADATA_KEY,
+};
 use crate::io::dataframe::{CellDataFrame, DataframeDataset};
 use crate::io::{GraphKey, Storage};
 use crate::weight::{StandardWeight, Weight};
@@ -93,6 +96,24 @@ impl ServerImpl {
             .map(|g| (g, gk))
     }
 
+    /// select how Arrow IPC chunks get delivered to the client sending the `request`.
+    ///
+    /// The `shared_memory_dir` is only used for clients on the same host, remote clients
+    /// asking for it get the chunks inline.
+    fn chunk_sink<T>(&self, request: &Request<T>) -> ChunkSink {
+        match &self.config.shared_memory_dir {
+            Some(dir)
+                if request.metadata().contains_key(SHARED_MEMORY_METADATA_KEY)
+                    && request
+                        .remote_addr()
+                        .map_or(false, |addr| is_loopback(&addr)) =>
+            {
+                ChunkSink::SharedMemory(dir.clone())
+            }
+            _ => ChunkSink::Inline,
+        }
+    }
+
     fn dataset_by_name(&self, dataset_name: &str) -> Result<&DataframeDataset, Status> {
         self.config.datasets.get(dataset_name).ok_or_else(|| {
             logged_status!(
@@ -120,21 +141,13 @@ impl ServerImpl {
     ) -> Result<LoadedCellSelection, Status> {
         let Some(cell_selection) = cell_selection else { return Err(logged_status!(format!("empty cell selection '{selection_name}' given"), Code::InvalidArgument, Level::INFO)) };
 
+        reject_legacy_cells(&cell_selection.legacy_cells)?;
+
         // build a complete list of the requested h3cells transformed to the
         // correct resolution
         let mut cells = block_in_place(|| {
-            let mut cells: Vec<_> = transform_resolution(
-                cell_selection.cells.iter().filter_map(|v| {
-                    if let Ok(cell) = CellIndex::try_from(*v) {
-                        Some(cell)
-                    } else {
-                        warn!("invalid h3 index {} ignored", v);
-                        None
-                    }
-                }),
-                h3_resolution,
-            )
-            .collect();
+            let mut cells: Vec<_> =
+                valid_cells_at_resolution(&cell_selection.cells, h3_resolution).collect();
             cells.sort_unstable();
             cells.dedup();
             cells
@@ -214,12 +227,24 @@ impl Rout3Serv for ServerImpl {
         &self,
         request: Request<H3ShortestPathRequest>,
     ) -> Result<Response<Self::H3ShortestPathStream>, Status> {
+        let sink = self.chunk_sink(&request);
         shortest_path::h3_shortest_path(
             shortest_path::create_parameters(request.into_inner(), self).await?,
+            sink,
         )
         .await
     }
 
+    type H3ShortestPathBatchedStream = ReceiverStream<Result<H3ShortestPathBatchChunk, Status>>;
+
+    async fn h3_shortest_path_batched(
+        &self,
+        request: Request<H3ShortestPathBatchRequest>,
+    ) -> Result<Response<Self::H3ShortestPathBatchedStream>, Status> {
+        let sink = self.chunk_sink(&request);
+        shortest_path::h3_shortest_path_batched(request.into_inner().requests, self, sink).await
+    }
+
     type H3ShortestPathRoutesStream = ReceiverStream<Result<RouteWkb, Status>>;
 
     async fn h3_shortest_path_routes(
@@ -267,6 +292,7 @@ impl Rout3Serv for ServerImpl {
         &self,
         request: Request<DifferentialShortestPathRequest>,
     ) -> Result<Response<ArrowIpcChunkStream>, Status> {
+        let sink = self.chunk_sink(&request);
         let input = differential_shortest_path::collect_input(request.into_inner(), self).await?;
 
         let do_store_output = input.store_output;
@@ -277,6 +303,7 @@ impl Rout3Serv for ServerImpl {
         let response_fut = stream_dataframe(
             output.object_id.clone(),
             differential_shortest_path::disturbance_statistics(&output)?,
+            sink,
         );
 
         let response = if do_store_output {
@@ -303,7 +330,9 @@ impl Rout3Serv for ServerImpl {
         &self,
         request: Request<IdRef>,
     ) -> Result<Response<ArrowIpcChunkStream>, Status> {
+        let sink = self.chunk_sink(&request);
         let inner = request.into_inner();
+        reject_legacy_cells(&inner.legacy_cells)?;
         let output: differential_shortest_path::DspOutput = self
             .storage
             .retrieve(&self.build_output_key(&inner.object_id))
@@ -313,6 +342,7 @@ impl Rout3Serv for ServerImpl {
         stream_dataframe(
             output.object_id.clone(),
             differential_shortest_path::disturbance_statistics(&output)?,
+            sink,
         )
         .await
     }
@@ -370,8 +400,10 @@ impl Rout3Serv for ServerImpl {
         &self,
         request: Request<H3WithinThresholdRequest>,
     ) -> Result<Response<Self::H3CellsWithinThresholdStream>, Status> {
+        let sink = self.chunk_sink(&request);
         within_threshold::within_threshold(
             within_threshold::create_parameters(request.into_inner(), self).await?,
+            sink,
         )
         .await
     }
@@ -390,6 +422,12 @@ async fn run_server(server_config: ServerConfig) -> anyhow::Result<()> {
     info!("creating grpc server");
     let server_impl: ServerImpl = ServerImpl::create(server_config).await?;
 
+    if let Some(dir) = server_impl.config.shared_memory_dir.clone() {
+        std::fs::create_dir_all(&dir)
+            .map_err(|e| anyhow::anyhow!("creating shared_memory_dir {:?} failed: {}", dir, e))?;
+        tokio::spawn(sweep_shared_memory_dir(dir));
+    }
+
     info!("{} is listening on {}", env!("CARGO_PKG_NAME"), addr);
 
     Server::builder()
@@ -7,16 +7,21 @@ use hexigraph::algorithm::graph::ShortestPathManyToMany;
 use hexigraph::HasH3Resolution;
 use ordered_float::OrderedFloat;
 use polars::prelude::{DataFrame, NamedFrom, Series};
+use tokio::sync::mpsc;
 use tokio_stream::wrappers::ReceiverStream;
+use tokio_stream::StreamExt;
 use tonic::{Response, Status};
+use tracing::warn;
 use uom::si::time::second;
 
 use crate::customization::{CustomizedGraph, CustomizedWeight};
+use crate::grpc::api::generated::h3_shortest_path_batch_chunk::Payload;
+use crate::grpc::api::generated::{H3ShortestPathBatchChunk, H3ShortestPathRequest};
 use crate::grpc::api::Route;
 use crate::grpc::error::{StatusCodeAndMessage, ToStatusResult};
 use crate::grpc::util::{
     inner_join_h3dataframe, spawn_blocking_status, stream_dataframe, stream_routes,
-    ArrowIpcChunkStream,
+    ArrowIpcChunkStream, ChunkSink,
 };
 use crate::grpc::{names, LoadedCellSelection, ServerImpl};
 use crate::weight::Weight;
@@ -29,7 +34,7 @@ pub struct H3ShortestPathParameters {
 }
 
 pub(crate) async fn create_parameters(
-    request: super::api::generated::H3ShortestPathRequest,
+    request: H3ShortestPathRequest,
     server_impl: &ServerImpl,
 ) -> Result<H3ShortestPathParameters, Status> {
     let routing_mode = server_impl.config.get_routing_mode(&request.routing_mode)?;
@@ -70,14 +75,86 @@ where
 
 pub async fn h3_shortest_path(
     parameters: H3ShortestPathParameters,
+    sink: ChunkSink,
 ) -> Result<Response<ArrowIpcChunkStream>, Status> {
     stream_dataframe(
         uuid::Uuid::new_v4().to_string(),
         spawn_h3_shortest_path(move || h3_shortest_path_internal(parameters)).await?,
+        sink,
     )
     .await
 }
 
+/// run the requests of a batch one after the other and stream their results tagged with the
+/// index of the request.
+///
+/// Each request is handled exactly like a single `h3_shortest_path` request. Failing requests
+/// are reported within the stream and do not affect the other requests of the batch.
+pub async fn h3_shortest_path_batched(
+    requests: Vec<H3ShortestPathRequest>,
+    server_impl: &ServerImpl,
+    sink: ChunkSink,
+) -> Result<Response<ReceiverStream<Result<H3ShortestPathBatchChunk, Status>>>, Status> {
+    let mut results = Vec::with_capacity(requests.len());
+    for request in requests {
+        let result = match create_parameters(request, server_impl).await {
+            Ok(parameters) => {
+                spawn_h3_shortest_path(move || h3_shortest_path_internal(parameters)).await
+            }
+            Err(status) => Err(status),
+        };
+        results.push(result);
+    }
+
+    let (tx, rx) = mpsc::channel(5);
+    tokio::spawn(async move {
+        for (batch_index, result) in results.into_iter().enumerate() {
+            let batch_index = batch_index as u32;
+            let chunks = match result {
+                Ok(dataframe) => {
+                    stream_dataframe(uuid::Uuid::new_v4().to_string(), dataframe, sink.clone())
+                        .await
+                }
+                Err(status) => Err(status),
+            };
+
+            let sent = match chunks {
+                Ok(response) => {
+                    let mut chunks = response.into_inner();
+                    let mut sent = true;
+                    while let Some(chunk) = chunks.next().await {
+                        let batch_chunk = match chunk {
+                            Ok(chunk) => H3ShortestPathBatchChunk {
+                                batch_index,
+                                payload: Some(Payload::Chunk(chunk)),
+                            },
+                            Err(status) => batch_error(batch_index, status),
+                        };
+                        if tx.send(Ok(batch_chunk)).await.is_err() {
+                            sent = false;
+                            break;
+                        }
+                    }
+                    sent
+                }
+                Err(status) => tx.send(Ok(batch_error(batch_index, status))).await.is_ok(),
+            };
+            if !sent {
+                warn!("Streaming batched shortest paths aborted. reason: receiver dropped");
+                break;
+            }
+        }
+    });
+    Ok(Response::new(ReceiverStream::new(rx)))
+}
+
+fn batch_error(batch_index: u32, status: Status) -> H3ShortestPathBatchChunk {
+    H3ShortestPathBatchChunk {
+        batch_index,
+        payload: Some(Payload::Error(status.message().to_string())),
+    }
+}
+
 #[derive(Ord, PartialOrd, Eq, PartialEq, Clone)]
 struct PathSummary<W> {
     cost: W,
@@ -1,6 +1,10 @@
 //! utility functions to use within the grpc context, most of them
 //! return a `tonic::Status` on error and a somewhat useful error message + logging.
 
+use std::net::{IpAddr, SocketAddr};
+use std::path::{Path, PathBuf};
+use std::time::Duration;
+
 use h3o::{CellIndex, Resolution};
 use hexigraph::algorithm::resolution::transform_resolution;
 use itertools::Itertools;
@@ -10,11 +14,12 @@ use tokio::sync::mpsc;
 use tokio::task::block_in_place;
 use tokio_stream::wrappers::ReceiverStream;
 use tonic::{Code, Response, Status};
-use tracing::{debug, warn};
+use tracing::{debug, warn, Level};
 
+use crate::grpc::api::generated::arrow_ipc_chunk::Payload;
 use crate::grpc::api::generated::ArrowIpcChunk;
 use crate::grpc::api::Route;
-use crate::grpc::error::ToStatusResult;
+use crate::grpc::error::{logged_status, ToStatusResult};
 use crate::io::dataframe::CellDataFrame;
 
 /// wrapper around tokios `spawn_blocking` to directly
@@ -34,6 +39,109 @@ pub trait StrId {
 /// type for a stream of ArrowRecordBatches to a GRPC client
 pub type ArrowIpcChunkStream = ReceiverStream<Result<ArrowIpcChunk, Status>>;
 
+/// request metadata key set by clients which want to receive Arrow IPC chunks
+/// via the `shared_memory_dir`.
+pub const SHARED_MEMORY_METADATA_KEY: &str = "rout3serv-shared-memory";
+
+/// age after which files in the `shared_memory_dir` are considered orphaned.
+///
+/// Clients remove the files after opening them. Files remain when a client disconnects
+/// before reading all chunks or is not running on the same host as the server.
+const SHARED_MEMORY_MAX_FILE_AGE: Duration = Duration::from_secs(60 * 60);
+
+/// interval in which the `shared_memory_dir` is checked for orphaned files.
+const SHARED_MEMORY_SWEEP_INTERVAL: Duration = Duration::from_secs(5 * 60);
+
+/// how serialized Arrow IPC chunks are delivered to the client
+#[derive(Clone, Debug)]
+pub enum ChunkSink {
+    /// as bytes within the grpc message
+    Inline,
+
+    /// written to a file in the given directory, only the path is sent to the client.
+    SharedMemory(PathBuf),
+}
+
+impl ChunkSink {
+    fn payload(&self, ipc_bytes: Vec<u8>) -> Result<Payload, Status> {
+        match self {
+            Self::Inline => Ok(Payload::Data(ipc_bytes)),
+            Self::SharedMemory(dir) => {
+                let path = dir.join(format!("{}.arrow", uuid::Uuid::new_v4()));
+                std::fs::write(&path, ipc_bytes)
+                    .to_status_result_with_message(Code::Internal, || {
+                        "writing chunk to shared memory failed".to_string()
+                    })?;
+                Ok(Payload::ShmPath(path.to_string_lossy().to_string()))
+            }
+        }
+    }
+}
+
+/// only clients connecting via the loopback interface run on the same host as the server
+/// and can use the `shared_memory_dir`.
+pub fn is_loopback(remote_addr: &SocketAddr) -> bool {
+    match remote_addr.ip() {
+        IpAddr::V4(ip) => ip.is_loopback(),
+        IpAddr::V6(ip) => ip
+            .to_ipv4_mapped()
+            .map_or_else(|| ip.is_loopback(), |ip| ip.is_loopback()),
+    }
+}
+
+fn remove_shared_memory_file(path: &Path) {
+    if let Err(e) = std::fs::remove_file(path) {
+        // the client removes the file after opening it
+        if e.kind() != std::io::ErrorKind::NotFound {
+            warn!("removing shared memory file {:?} failed: {}", path, e);
+        }
+    }
+}
+
+/// remove all Arrow IPC chunk files older than `max_age` from `dir`.
+fn remove_stale_shared_memory_files(dir: &Path, max_age: Duration) -> std::io::Result<usize> {
+    let mut num_removed = 0;
+    for entry in std::fs::read_dir(dir)? {
+        let path = entry?.path();
+        if path.extension().map_or(true, |ext| ext != "arrow") {
+            continue;
+        }
+        let is_stale = std::fs::metadata(&path)
+            .and_then(|metadata| metadata.modified())
+            .map(|modified| modified.elapsed().unwrap_or_default() >= max_age)
+            .unwrap_or(false);
+        if is_stale {
+            remove_shared_memory_file(&path);
+            num_removed += 1;
+        }
+    }
+    Ok(num_removed)
+}
+
+/// periodically remove orphaned Arrow IPC chunk files from the `shared_memory_dir`.
+///
+/// The first sweep runs directly when called to clean up after previous runs of the server.
+pub async fn sweep_shared_memory_dir(dir: PathBuf) {
+    let mut interval = tokio::time::interval(SHARED_MEMORY_SWEEP_INTERVAL);
+    loop {
+        interval.tick().await;
+        let sweep_dir = dir.clone();
+        match spawn_blocking_status(move || {
+            remove_stale_shared_memory_files(&sweep_dir, SHARED_MEMORY_MAX_FILE_AGE)
+        })
+        .await
+        {
+            Ok(Ok(num_removed)) => {
+                if num_removed > 0 {
+                    debug!("removed {} orphaned files from {:?}", num_removed, dir);
+                }
+            }
+            Ok(Err(e)) => warn!("sweeping shared memory dir {:?} failed: {}", dir, e),
+            Err(e) => warn!("sweeping shared memory dir {:?} failed: {}", dir, e),
+        }
+    }
+}
+
 /// stream `RouteWKB` instances
 pub async fn stream_routes<R>(
     routewkbs: Vec<R>,
@@ -53,6 +161,41 @@ where
     Ok(Response::new(ReceiverStream::new(rx)))
 }
 
+/// convert the `h3indexes` to cells of the given `h3_resolution`.
+///
+/// Invalid h3 indexes are ignored and logged.
+pub fn valid_cells_at_resolution(
+    h3indexes: &[u64],
+    h3_resolution: Resolution,
+) -> impl Iterator<Item = CellIndex> + '_ {
+    transform_resolution(
+        h3indexes.iter().filter_map(|v| {
+            if let Ok(cell) = CellIndex::try_from(*v) {
+                Some(cell)
+            } else {
+                warn!("invalid h3 index {} ignored", v);
+                None
+            }
+        }),
+        h3_resolution,
+    )
+}
+
+/// reject h3 indexes sent in the uint64 encoding of clients before 0.7.0.
+///
+/// Ignoring these would silently lead to empty results.
+pub fn reject_legacy_cells(legacy_cells: &[u64]) -> Result<(), Status> {
+    if legacy_cells.is_empty() {
+        Ok(())
+    } else {
+        Err(logged_status!(
+            "h3 indexes sent in the encoding of clients before 0.7.0, please upgrade the client",
+            Code::InvalidArgument,
+            Level::INFO
+        ))
+    }
+}
+
 pub fn change_cell_resolution_dedup(
     cells: &[CellIndex],
     h3_resolution: Resolution,
@@ -67,8 +210,9 @@ pub fn change_cell_resolution_dedup(
 pub async fn stream_dataframe(
     id: String,
     dataframe: DataFrame,
+    sink: ChunkSink,
 ) -> Result<Response<ArrowIpcChunkStream>, Status> {
-    stream_dataframe_with_max_rows(id, dataframe, 3000).await
+    stream_dataframe_with_max_rows(id, dataframe, 3000, sink).await
 }
 
 /// respond with a dataframe as a stream of size limited Arrow IPC chunks.
@@ -79,6 +223,7 @@ pub async fn stream_dataframe_with_max_rows(
     id: String,
     dataframe: DataFrame,
     max_rows: usize,
+    sink: ChunkSink,
 ) -> Result<Response<ArrowIpcChunkStream>, Status> {
     let df_shape = dataframe.shape();
     debug!(
@@ -100,17 +245,30 @@ pub async fn stream_dataframe_with_max_rows(
 
     let (tx, rx) = mpsc::channel(5);
     tokio::spawn(async move {
+        let mut shm_paths = vec![];
         for mut df_part in dataframe_parts {
             let serialization_result = block_in_place(|| dataframe_to_bytes(&mut df_part))
                 .to_status_result_with_message(Code::Internal, || {
                     "serializing dataframe failed".to_string()
                 })
-                .map(|ipc_bytes| ArrowIpcChunk {
+                .and_then(|ipc_bytes| block_in_place(|| sink.payload(ipc_bytes)))
+                .map(|payload| ArrowIpcChunk {
                     object_id: id.clone(),
-                    data: ipc_bytes,
+                    payload: Some(payload),
                 });
+            if let Ok(ArrowIpcChunk {
+                payload: Some(Payload::ShmPath(path)),
+                ..
+            }) = &serialization_result
+            {
+                shm_paths.push(PathBuf::from(path));
+            }
             if let Err(e) = tx.send(serialization_result).await {
                 warn!("Streaming dataframe parts aborted. reason: {}", e);
+
+                // the client is gone and will not open the files of this stream - including
+                // the ones still queued in the channel.
+                block_in_place(|| shm_paths.iter().for_each(|p| remove_shared_memory_file(p)));
                 break;
             }
         }
@@ -171,3 +329,97 @@ pub fn inner_join_h3dataframe(
         })?;
     Ok(())
 }
+
+#[cfg(test)]
+mod tests {
+    use std::fs::File;
+    use std::net::SocketAddr;
+    use std::path::PathBuf;
+    use std::time::{Duration, SystemTime};
+
+    use crate::grpc::api::generated::arrow_ipc_chunk::Payload;
+
+    use super::{is_loopback, reject_legacy_cells, remove_stale_shared_memory_files, ChunkSink};
+
+    fn create_test_dir() -> PathBuf {
+        let dir = std::env::temp_dir().join(format!("rout3serv-test-{}", uuid::Uuid::new_v4()));
+        std::fs::create_dir_all(&dir).unwrap();
+        dir
+    }
+
+    fn create_file(path: &PathBuf, age: Duration) {
+        let file = File::create(path).unwrap();
+        file.set_modified(SystemTime::now() - age).unwrap();
+    }
+
+    #[test]
+    fn stale_shared_memory_files_get_removed() {
+        let dir = create_test_dir();
+        let old_chunk = dir.join("old.arrow");
+        let fresh_chunk = dir.join("fresh.arrow");
+        let old_other = dir.join("old.txt");
+        create_file(&old_chunk, Duration::from_secs(7200));
+        create_file(&fresh_chunk, Duration::from_secs(10));
+        create_file(&old_other, Duration::from_secs(7200));
+
+        let num_removed =
+            remove_stale_shared_memory_files(&dir, Duration::from_secs(3600)).unwrap();
+
+        assert_eq!(num_removed, 1);
+        assert!(!old_chunk.exists());
+        assert!(fresh_chunk.exists());
+        assert!(old_other.exists());
+        std::fs::remove_dir_all(&dir).unwrap();
+    }
+
+    #[test]
+    fn shared_memory_payload_is_written_to_file() {
+        let dir = create_test_dir();
+
+        let payload = ChunkSink::SharedMemory(dir.clone())
+            .payload(vec![1, 2, 3])
+            .unwrap();
+
+        let Payload::ShmPath(path) = payload else {
+            panic!("expected a shm_path payload");
+        };
+        let path = PathBuf::from(path);
+        assert_eq!(path.parent(), Some(dir.as_path()));
+        assert_eq!(path.extension().unwrap(), "arrow");
+        assert!(uuid::Uuid::parse_str(path.file_stem().unwrap().to_str().unwrap()).is_ok());
+        assert_eq!(std::fs::read(&path).unwrap(), vec![1, 2, 3]);
+        std::fs::remove_dir_all(&dir).unwrap();
+    }
+
+    #[test]
+    fn inline_payload() {
+        assert_eq!(
+            ChunkSink::Inline.payload(vec![1, 2, 3]).unwrap(),
+            Payload::Data(vec![1, 2, 3])
+        );
+    }
+
+    #[test]
+    fn legacy_cells_get_rejected() {
+        assert!(reject_legacy_cells(&[]).is_ok());
+        assert_eq!(
+            reject_legacy_cells(&[0x8a1fb46622dffff])
+                .unwrap_err()
+                .code(),
+            tonic::Code::InvalidArgument
+        );
+    }
+
+    #[test]
+    fn loopback_addresses() {
+        for (addr, expected) in [
+            ("127.0.0.1:7088", true),
+            ("[::1]:7088", true),
+            ("[::ffff:127.0.0.1]:7088", true),
+            ("192.168.1.2:7088", false),
+            ("[2001:db8::1]:7088", false),
+        ] {
+            assert_eq!(is_loopback(&addr.parse::<SocketAddr>().unwrap()), expected);
+        }
+    }
+}
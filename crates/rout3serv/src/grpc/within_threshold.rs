@@ -9,7 +9,7 @@ use uom::si::time::second;
 use crate::customization::{CustomizedGraph, CustomizedWeight};
 use crate::grpc::error::{logged_status, ToStatusResult};
 use crate::grpc::util::{
-    inner_join_h3dataframe, spawn_blocking_status, stream_dataframe, ArrowIpcChunkStream,
+    inner_join_h3dataframe, spawn_blocking_status, stream_dataframe, ArrowIpcChunkStream, ChunkSink,
 };
 use crate::grpc::{LoadedCellSelection, ServerImpl};
 use crate::weight::Weight;
@@ -64,6 +64,7 @@ pub(crate) async fn create_parameters(
 
 pub async fn within_threshold(
     parameters: H3WithinThresholdParameters,
+    sink: ChunkSink,
 ) -> Result<Response<ArrowIpcChunkStream>, Status> {
     stream_dataframe(
         uuid::Uuid::new_v4().to_string(),
@@ -72,6 +73,7 @@ pub async fn within_threshold(
             .to_status_result_with_message(Code::Internal, || {
                 "calculating within threshold failed".to_string()
             })?,
+        sink,
     )
     .await
 }
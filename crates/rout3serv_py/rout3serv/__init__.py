@@ -1,10 +1,15 @@
-__version__ = '0.2.1'
+__version__ = '0.7.0'
 
+import array
+import collections.abc
+import os
+import pathlib
 import typing
 
 import grpc
+import numpy as np
 import pyarrow as pa
-import shapely.wkb
+import shapely
 from shapely.geometry import Point
 from shapely.geometry.base import BaseGeometry
 
@@ -15,6 +20,13 @@ from .rout3serv_pb2_grpc import Rout3ServStub
 DEFAULT_PORT = 7088
 DEFAULT_HOST = "127.0.0.1"
 
+# shared request message for the RPCs without parameters. Must not be modified.
+_EMPTY = rout3serv_pb2.Empty()
+
+
+class RequestError(Exception):
+    """a single request of a batch failed on the server"""
+
 
 class TableWithId:
     table: typing.Optional[pa.Table]
@@ -25,12 +37,27 @@ class TableWithId:
         self.table = table
 
 
+class RecordBatchReaderWithId:
+    reader: typing.Optional[pa.RecordBatchReader]
+    id: str
+
+    def __init__(self, id: str, reader: typing.Optional[pa.RecordBatchReader]):
+        self.id = id
+        self.reader = reader
+
+    def to_table(self) -> TableWithId:
+        """read all remaining batches into a table"""
+        table = None
+        if self.reader is not None:
+            table = self.reader.read_all()
+        return TableWithId(self.id, table)
+
+
 def cell_selection(cells: typing.Iterable[int], dataset_name: str = None) -> rout3serv_pb2.CellSelection:
     cs = rout3serv_pb2.CellSelection()
     if dataset_name is not None:
         cs.dataset_name = dataset_name
-    for cell in cells:
-        cs.cells.append(cell)
+    cs.cells.extend(_cells_to_list(cells))
     return cs
 
 
@@ -38,24 +65,29 @@ def _to_cell_selection(arg, **kwargs) -> rout3serv_pb2.CellSelection:
     if isinstance(arg, rout3serv_pb2.CellSelection):
         return arg
     dataset_name = kwargs.get("dataset_name")
-    if hasattr(arg, '__iter__'):
+    if isinstance(arg, collections.abc.Iterable):
         return cell_selection(arg, dataset_name=dataset_name)
     raise Exception("unsupported type for cell_selection")
 
 
+def _cells_to_list(cells: typing.Iterable[int]) -> typing.Iterable[int]:
+    """convert numpy arrays of cells to a list in one step, as adding numpy scalars
+    to a repeated protobuf field one by one is slow."""
+    if isinstance(cells, np.ndarray):
+        return cells.astype(np.uint64, copy=False).tolist()
+    return cells
+
+
 def build_h3_shortest_path_request(graph_handle: GraphHandle, origin_cells, destination_cells,
                                    num_destinations_to_reach: int = 3,
                                    num_gap_cells_to_graph: int = 1,
                                    smoothen_geometries: bool = False,
                                    routing_mode: typing.Optional[str] = None,
                                    ) -> rout3serv_pb2.H3ShortestPathRequest:
-    shortest_path_options = rout3serv_pb2.ShortestPathOptions()
-    shortest_path_options.num_destinations_to_reach = num_destinations_to_reach
-    shortest_path_options.num_gap_cells_to_graph = num_gap_cells_to_graph
-
     request = rout3serv_pb2.H3ShortestPathRequest()
-    request.graph_handle.MergeFrom(graph_handle)
-    request.options.MergeFrom(shortest_path_options)
+    request.graph_handle.CopyFrom(graph_handle)
+    request.options.num_destinations_to_reach = num_destinations_to_reach
+    request.options.num_gap_cells_to_graph = num_gap_cells_to_graph
     request.origins.MergeFrom(_to_cell_selection(origin_cells))
     request.destinations.MergeFrom(_to_cell_selection(destination_cells))
     request.smoothen_geometries = smoothen_geometries
@@ -69,7 +101,7 @@ def build_h3_within_threshold_request(graph_handle: GraphHandle, origin_cells,
                                       routing_mode: typing.Optional[str] = None,
                                       ) -> rout3serv_pb2.H3WithinThresholdRequest:
     request = rout3serv_pb2.H3WithinThresholdRequest()
-    request.graph_handle.MergeFrom(graph_handle)
+    request.graph_handle.CopyFrom(graph_handle)
     request.origins.MergeFrom(_to_cell_selection(origin_cells))
     request.travel_duration_secs_threshold = travel_duration_secs_threshold
     if routing_mode:
@@ -77,7 +109,8 @@ def build_h3_within_threshold_request(graph_handle: GraphHandle, origin_cells,
     return request
 
 
-def build_differential_shortest_path_request(graph_handle: GraphHandle, disturbance_geom: BaseGeometry,
+def build_differential_shortest_path_request(graph_handle: GraphHandle,
+                                             disturbance_geom: typing.Union[BaseGeometry, bytes],
                                              radius_meters: float,
                                              destination_points: typing.Iterable[Point],
                                              ref_dataset_name: str,
@@ -85,24 +118,30 @@ def build_differential_shortest_path_request(graph_handle: GraphHandle, disturba
                                              num_gap_cells_to_graph: int = 1,
                                              downsampled_prerouting: bool = False,
                                              store_output: bool = True,
+                                             destination_cells: typing.Optional[typing.Iterable[int]] = None,
                                              ) -> rout3serv_pb2.DifferentialShortestPathRequest:
-    shortest_path_options = rout3serv_pb2.ShortestPathOptions()
-    shortest_path_options.num_destinations_to_reach = num_destinations_to_reach
-    shortest_path_options.num_gap_cells_to_graph = num_gap_cells_to_graph
+    """`disturbance_geom` may also be given as WKB to avoid encoding the same geometry
+    again when it is used for many requests.
 
+    Destinations already known as h3 cells can be passed as `destination_cells` instead of or
+    in addition to `destination_points`."""
     request = rout3serv_pb2.DifferentialShortestPathRequest()
     request.ref_dataset_name = ref_dataset_name
-    request.graph_handle.MergeFrom(graph_handle)
-    request.options.MergeFrom(shortest_path_options)
-    request.disturbance_wkb_geometry = shapely.wkb.dumps(disturbance_geom)
+    request.graph_handle.CopyFrom(graph_handle)
+    request.options.num_destinations_to_reach = num_destinations_to_reach
+    request.options.num_gap_cells_to_graph = num_gap_cells_to_graph
+    if isinstance(disturbance_geom, bytes):
+        request.disturbance_wkb_geometry = disturbance_geom
+    else:
+        request.disturbance_wkb_geometry = shapely.to_wkb(disturbance_geom)
     request.radius_meters = radius_meters
     request.downsampled_prerouting = downsampled_prerouting
     request.store_output = store_output
 
-    for destination_point in destination_points:
-        pt = request.destinations.add()
-        pt.x = destination_point.x
-        pt.y = destination_point.y
+    coordinates = shapely.get_coordinates(list(destination_points))
+    request.destinations.extend(rout3serv_pb2.Point(x=x, y=y) for x, y in coordinates.tolist())
+    if destination_cells is not None:
+        request.destination_cells.extend(_cells_to_list(destination_cells))
     return request
 
 
@@ -111,36 +150,97 @@ def build_differential_shortest_path_routes_request(object_id: str, cells: typin
     request = rout3serv_pb2.DifferentialShortestPathRoutesRequest()
     request.object_id = object_id
     request.smoothen_geometries = smoothen_geometries
-    for cell in cells:
-        request.cells.append(cell)
+    request.cells.extend(_cells_to_list(cells))
     return request
 
 
+# default channel options. The responses mostly consist of large binary
+# Arrow IPC chunks, so message size limits and the HTTP/2 frame size are raised
+# and BDP probing is enabled to let the flow-control window grow.
+# Only the identity encoding is advertised to the server, otherwise it would gzip
+# all responses.
+DEFAULT_GRPC_OPTIONS = (
+    ("grpc.max_receive_message_length", 256 * 1024 * 1024),
+    ("grpc.max_send_message_length", 256 * 1024 * 1024),
+    ("grpc.http2.max_frame_size", 16 * 1024 * 1024 - 1),  # largest frame size allowed by HTTP/2
+    ("grpc.http2.bdp_probe", 1),
+    ("grpc.compression_enabled_algorithms_bitset", 1),
+)
+
+# bitset enabling all compression algorithms of grpc
+_ALL_COMPRESSION_ALGORITHMS_BITSET = 0b111
+
+
 class Server:
     channel = None
     stub = None
+    arrow_metadata = None
 
     def __init__(self, hostport: str = f"{DEFAULT_HOST}:{DEFAULT_PORT}",
                  credentials: typing.Optional[grpc.ChannelCredentials] = None,
-                 grpc_options: typing.Any = None):
-        compression = grpc.Compression.Gzip
+                 grpc_options: typing.Any = None,
+                 compression: typing.Optional[grpc.Compression] = None,
+                 shared_memory: bool = False):
+        """
+        `grpc_options` are merged with - and take precedence over - `DEFAULT_GRPC_OPTIONS`.
+
+        Compression is disabled by default for requests and responses as Arrow payloads and WKB
+        compress poorly compared to the CPU time spent. Pass `compression=grpc.Compression.Gzip`
+        to enable it for both.
+
+        `shared_memory` lets the server hand over Arrow data as files in its `shared_memory_dir`
+        instead of sending it through the connection. Only usable when client and server run
+        on the same host. Servers without a `shared_memory_dir` send the data as usual.
+
+        Channels to the same server share one connection within a process. Many concurrent
+        requests from threads can be spread over multiple connections by creating a `Server`
+        per connection with `grpc_options=[("grpc.use_local_subchannel_pool", 1)]`.
+        """
+        options = _channel_options(grpc_options, compression)
         if credentials is not None:
-            self.channel = grpc.secure_channel(hostport, credentials, compression=compression, options=grpc_options)
+            self.channel = grpc.secure_channel(hostport, credentials, compression=compression, options=options)
         else:
-            self.channel = grpc.insecure_channel(hostport, compression=compression, options=grpc_options)
+            self.channel = grpc.insecure_channel(hostport, compression=compression, options=options)
         self.stub = Rout3ServStub(self.channel)
+        self.arrow_metadata = _arrow_metadata(shared_memory)
 
     def version(self) -> rout3serv_pb2.VersionResponse:
-        return self.stub.Version(rout3serv_pb2.Empty())
+        return self.stub.Version(_EMPTY)
 
     def list_graphs(self) -> rout3serv_pb2.ListGraphsResponse:
-        return self.stub.ListGraphs(rout3serv_pb2.Empty())
+        return self.stub.ListGraphs(_EMPTY)
 
     def list_datasets(self) -> typing.List[str]:
-        return self.stub.ListDatasets(rout3serv_pb2.Empty()).dataset_name
+        return self.stub.ListDatasets(_EMPTY).dataset_name
 
     def h3_shortest_path(self, request: rout3serv_pb2.H3ShortestPathRequest) -> TableWithId:
-        return _arrowipcchunks_to_table(self.stub.H3ShortestPath(request))
+        return self.h3_shortest_path_stream(request).to_table()
+
+    def h3_shortest_path_stream(self, request: rout3serv_pb2.H3ShortestPathRequest) -> RecordBatchReaderWithId:
+        """streaming variant of `h3_shortest_path`. Batches can be consumed while they are still received."""
+        return _arrowipcchunks_to_reader(self.stub.H3ShortestPath(request, metadata=self.arrow_metadata))
+
+    def h3_shortest_path_batched(self, requests: typing.Sequence[rout3serv_pb2.H3ShortestPathRequest]) -> \
+            typing.List[typing.Union[TableWithId, "RequestError"]]:
+        """run many requests with a single call to the server.
+
+        The server handles each request exactly like a separate `h3_shortest_path` call. Returns
+        one entry per request - in the order of `requests`. Failed requests are returned as
+        `RequestError` instead of a `TableWithId` without affecting the other requests."""
+        if not requests:
+            return []
+        batch_request = rout3serv_pb2.H3ShortestPathBatchRequest()
+        batch_request.requests.extend(requests)
+
+        chunks = [[] for _ in requests]
+        errors = {}
+        for batch_chunk in self.stub.H3ShortestPathBatched(batch_request, metadata=self.arrow_metadata):
+            if batch_chunk.WhichOneof("payload") == "error":
+                errors[batch_chunk.batch_index] = RequestError(batch_chunk.error)
+            else:
+                chunks[batch_chunk.batch_index].append(batch_chunk.chunk)
+        return [errors[i] if i in errors else _arrowipcchunks_to_reader(request_chunks).to_table()
+                for i, request_chunks in enumerate(chunks)]
 
     def h3_shortest_path_routes(self, request: rout3serv_pb2.H3ShortestPathRequest) -> typing.Generator[
         RouteWKB, None, None]:
@@ -167,15 +267,29 @@ class Server:
 
     def h3_cells_within_threshold(self, request: rout3serv_pb2.H3WithinThresholdRequest) -> TableWithId:
         """graph cells with in a certain threshold of origin cells"""
-        return _arrowipcchunks_to_table(self.stub.H3CellsWithinThreshold(request))
+        return self.h3_cells_within_threshold_stream(request).to_table()
+
+    def h3_cells_within_threshold_stream(self,
+                                         request: rout3serv_pb2.H3WithinThresholdRequest) -> RecordBatchReaderWithId:
+        """streaming variant of `h3_cells_within_threshold`"""
+        return _arrowipcchunks_to_reader(self.stub.H3CellsWithinThreshold(request, metadata=self.arrow_metadata))
 
     def differential_shortest_path(self, request: rout3serv_pb2.DifferentialShortestPathRequest) -> TableWithId:
-        return _arrowipcchunks_to_table(self.stub.DifferentialShortestPath(request))
+        return self.differential_shortest_path_stream(request).to_table()
+
+    def differential_shortest_path_stream(self, request: rout3serv_pb2.DifferentialShortestPathRequest) \
+            -> RecordBatchReaderWithId:
+        """streaming variant of `differential_shortest_path`"""
+        return _arrowipcchunks_to_reader(self.stub.DifferentialShortestPath(request, metadata=self.arrow_metadata))
 
     def get_differential_shortest_path(self, object_id: str) -> TableWithId:
+        return self.get_differential_shortest_path_stream(object_id).to_table()
+
+    def get_differential_shortest_path_stream(self, object_id: str) -> RecordBatchReaderWithId:
+        """streaming variant of `get_differential_shortest_path`"""
         req = rout3serv_pb2.IdRef()
         req.object_id = object_id
-        return _arrowipcchunks_to_table(self.stub.GetDifferentialShortestPath(req))
+        return _arrowipcchunks_to_reader(self.stub.GetDifferentialShortestPath(req, metadata=self.arrow_metadata))
 
     def get_differential_shortest_path_routes(self, object_id: str, cells: typing.Iterable[int],
                                               smoothen_geometries: bool = False) -> "GeoDataFrame":
@@ -188,22 +302,199 @@ class Server:
         return _get_differential_shortest_path_routes_gdf(response)
 
 
-def _arrowipcchunks_to_table(response: rout3serv_pb2.ArrowIPCChunk) -> TableWithId:
-    """convert a streamed ArrowIPCChunk response to a pyarrow.Table"""
+class AsyncServer:
+    """asyncio variant of `Server` based on `grpc.aio`.
+
+    Allows running many requests concurrently from a single event loop thread.
+
+    Instead of the `*_stream` methods of `Server` returning a `RecordBatchReaderWithId`, the
+    `*_batches` methods return async generators yielding `(object_id, batch)` tuples."""
+    channel = None
+    stub = None
+    arrow_metadata = None
+
+    def __init__(self, hostport: str = f"{DEFAULT_HOST}:{DEFAULT_PORT}",
+                 credentials: typing.Optional[grpc.ChannelCredentials] = None,
+                 grpc_options: typing.Any = None,
+                 compression: typing.Optional[grpc.Compression] = None,
+                 shared_memory: bool = False):
+        """see `Server`"""
+        options = _channel_options(grpc_options, compression)
+        if credentials is not None:
+            self.channel = grpc.aio.secure_channel(hostport, credentials, compression=compression, options=options)
+        else:
+            self.channel = grpc.aio.insecure_channel(hostport, compression=compression, options=options)
+        self.stub = Rout3ServStub(self.channel)
+        self.arrow_metadata = _arrow_metadata(shared_memory)
+
+    async def close(self):
+        await self.channel.close()
+
+    async def __aenter__(self) -> "AsyncServer":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def version(self) -> rout3serv_pb2.VersionResponse:
+        return await self.stub.Version(_EMPTY)
+
+    async def list_graphs(self) -> rout3serv_pb2.ListGraphsResponse:
+        return await self.stub.ListGraphs(_EMPTY)
+
+    async def list_datasets(self) -> typing.List[str]:
+        return (await self.stub.ListDatasets(_EMPTY)).dataset_name
+
+    async def h3_shortest_path(self, request: rout3serv_pb2.H3ShortestPathRequest) -> TableWithId:
+        return await _aarrowipcchunks_to_table(self.stub.H3ShortestPath(request, metadata=self.arrow_metadata))
+
+    def h3_shortest_path_batches(self, request: rout3serv_pb2.H3ShortestPathRequest) -> typing.AsyncGenerator[
+        typing.Tuple[str, pa.RecordBatch], None]:
+        """async generator yielding `(object_id, batch)` tuples as soon as they are received"""
+        return _aiter_arrowipcchunk_batches(self.stub.H3ShortestPath(request, metadata=self.arrow_metadata))
+
+    def h3_shortest_path_routes(self, request: rout3serv_pb2.H3ShortestPathRequest) -> typing.AsyncIterator[
+        RouteWKB]:
+        return self.stub.H3ShortestPathRoutes(request)
+
+    def h3_shortest_path_cells(self, request: rout3serv_pb2.H3ShortestPathRequest) -> typing.AsyncIterator[
+        RouteH3Indexes]:
+        return self.stub.H3ShortestPathCells(request)
+
+    def h3_shortest_path_edges(self, request: rout3serv_pb2.H3ShortestPathRequest) -> typing.AsyncIterator[
+        RouteH3Indexes]:
+        return self.stub.H3ShortestPathEdges(request)
+
+    async def h3_shortest_path_linestrings(self, request: rout3serv_pb2.H3ShortestPathRequest) -> "GeoDataFrame":
+        return _h3_shortest_path_linestrings_gdf([route async for route in self.h3_shortest_path_routes(request)])
+
+    async def h3_cells_within_threshold(self, request: rout3serv_pb2.H3WithinThresholdRequest) -> TableWithId:
+        return await _aarrowipcchunks_to_table(self.stub.H3CellsWithinThreshold(request, metadata=self.arrow_metadata))
+
+    def h3_cells_within_threshold_batches(self, request: rout3serv_pb2.H3WithinThresholdRequest) \
+            -> typing.AsyncGenerator[typing.Tuple[str, pa.RecordBatch], None]:
+        return _aiter_arrowipcchunk_batches(self.stub.H3CellsWithinThreshold(request, metadata=self.arrow_metadata))
+
+    async def differential_shortest_path(self,
+                                         request: rout3serv_pb2.DifferentialShortestPathRequest) -> TableWithId:
+        return await _aarrowipcchunks_to_table(
+            self.stub.DifferentialShortestPath(request, metadata=self.arrow_metadata))
+
+    def differential_shortest_path_batches(self, request: rout3serv_pb2.DifferentialShortestPathRequest) \
+            -> typing.AsyncGenerator[typing.Tuple[str, pa.RecordBatch], None]:
+        return _aiter_arrowipcchunk_batches(self.stub.DifferentialShortestPath(request, metadata=self.arrow_metadata))
+
+    async def get_differential_shortest_path(self, object_id: str) -> TableWithId:
+        req = rout3serv_pb2.IdRef()
+        req.object_id = object_id
+        return await _aarrowipcchunks_to_table(
+            self.stub.GetDifferentialShortestPath(req, metadata=self.arrow_metadata))
+
+    def get_differential_shortest_path_batches(self, object_id: str) \
+            -> typing.AsyncGenerator[typing.Tuple[str, pa.RecordBatch], None]:
+        req = rout3serv_pb2.IdRef()
+        req.object_id = object_id
+        return _aiter_arrowipcchunk_batches(self.stub.GetDifferentialShortestPath(req, metadata=self.arrow_metadata))
+
+    async def get_differential_shortest_path_routes(self, object_id: str, cells: typing.Iterable[int],
+                                                    smoothen_geometries: bool = False) -> "GeoDataFrame":
+        response = self.stub.GetDifferentialShortestPathRoutes(
+            build_differential_shortest_path_routes_request(object_id, cells, smoothen_geometries=smoothen_geometries))
+        return _get_differential_shortest_path_routes_gdf([stream_item async for stream_item in response])
+
+
+def _arrow_metadata(shared_memory: bool) -> typing.Optional[typing.Tuple[typing.Tuple[str, str], ...]]:
+    if shared_memory:
+        return (("rout3serv-shared-memory", "1"),)
+    return None
+
+
+def _channel_options(grpc_options: typing.Any, compression: typing.Optional[grpc.Compression]) \
+        -> typing.List[typing.Tuple[str, typing.Any]]:
+    options = dict(DEFAULT_GRPC_OPTIONS)
+    if compression is not None and compression != grpc.Compression.NoCompression:
+        options["grpc.compression_enabled_algorithms_bitset"] = _ALL_COMPRESSION_ALGORITHMS_BITSET
+    if grpc_options:
+        options.update(grpc_options)
+    return list(options.items())
+
+
+def _arrowipcchunks_to_reader(response: rout3serv_pb2.ArrowIPCChunk) -> RecordBatchReaderWithId:
+    """wrap a streamed ArrowIPCChunk response in a pyarrow.RecordBatchReader
+
+    The chunks are in Arrow IPC file format. They are only read when the batches get
+    consumed from the reader and the batches are zero-copy views over the received bytes.
+    Only the first chunk is received before returning, as it is required for the schema."""
+    response = iter(response)
+    first_item = next(response, None)
+    if first_item is None:
+        return RecordBatchReaderWithId(None, None)
+    first_reader = _open_arrowipcchunk(first_item)
+
+    def iter_batches():
+        yield from _ipc_file_batches(first_reader)
+        for stream_item in response:
+            yield from _ipc_file_batches(_open_arrowipcchunk(stream_item))
+
+    return RecordBatchReaderWithId(first_item.object_id,
+                                   pa.RecordBatchReader.from_batches(first_reader.schema, iter_batches()))
+
+
+async def _aiter_arrowipcchunk_batches(response: typing.AsyncIterator[rout3serv_pb2.ArrowIPCChunk]) \
+        -> typing.AsyncGenerator[typing.Tuple[str, pa.RecordBatch], None]:
+    async for stream_item in response:
+        for batch in _ipc_file_batches(_open_arrowipcchunk(stream_item)):
+            yield stream_item.object_id, batch
+
+
+async def _aarrowipcchunks_to_table(response: typing.AsyncIterator[rout3serv_pb2.ArrowIPCChunk]) -> TableWithId:
+    """collect a streamed ArrowIPCChunk response in a table.
+
+    Matches `RecordBatchReaderWithId.to_table`: the table is None when no chunk was received and
+    empty - but with the schema of the first chunk - when the chunks contained no batches."""
     object_id = None
-    table = None
+    schema = None
     batches = []
-    for stream_item in response:
-        if object_id is None:
+    async for stream_item in response:
+        reader = _open_arrowipcchunk(stream_item)
+        if schema is None:
             object_id = stream_item.object_id
-        reader = pa.ipc.open_file(stream_item.data)
-        for i in range(reader.num_record_batches):
-            batches.append(reader.get_batch(i))
-    if len(batches) > 0:
-        table = pa.Table.from_batches(batches)
+            schema = reader.schema
+        batches.extend(_ipc_file_batches(reader))
+    table = None
+    if schema is not None:
+        table = pa.Table.from_batches(batches, schema=schema)
     return TableWithId(object_id, table)
 
 
+def _open_arrowipcchunk(stream_item: rout3serv_pb2.ArrowIPCChunk) -> pa.ipc.RecordBatchFileReader:
+    """open the Arrow IPC file of the chunk - either from the received bytes or from shared memory"""
+    if stream_item.WhichOneof("payload") == "shm_path":
+        path = _checked_shm_path(stream_item.shm_path)
+        source = pa.memory_map(path)
+        # the mapping stays valid after removing the file. The server removes orphaned
+        # files as well, so this is only done to free the memory early.
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        return pa.ipc.open_file(source)
+    return pa.ipc.open_file(pa.py_buffer(stream_item.data))
+
+
+def _checked_shm_path(path: str) -> str:
+    """reject paths which can not be Arrow IPC chunks in the `shared_memory_dir` of
+    the server, as the client removes the file after opening it."""
+    if not os.path.isabs(path) or ".." in pathlib.PurePath(path).parts or not path.endswith(".arrow"):
+        raise ValueError(f"server sent an unexpected shared memory path: {path!r}")
+    return path
+
+
+def _ipc_file_batches(reader: pa.ipc.RecordBatchFileReader) -> typing.Generator[pa.RecordBatch, None, None]:
+    for i in range(reader.num_record_batches):
+        yield reader.get_batch(i)
+
+
 def build_graph_handle(name: str, h3_resolution: int) -> GraphHandle:
     gh = GraphHandle()
     gh.name = name
@@ -211,64 +502,66 @@ def build_graph_handle(name: str, h3_resolution: int) -> GraphHandle:
     return gh
 
 
+class _RouteWKBColumns:
+    """collects the attributes of RouteWKB messages in typed column buffers"""
+
+    def __init__(self):
+        self.wkbs = []
+        self.h3index_origin = array.array("Q")
+        self.h3index_destination = array.array("Q")
+        self.travel_duration_secs = array.array("d")
+        self.edge_preference = array.array("d")
+        self.path_length_m = array.array("d")
+
+    def extend(self, routes: typing.Iterable[RouteWKB]):
+        # bound methods as locals to avoid the attribute lookups in the loop
+        append_origin = self.h3index_origin.append
+        append_destination = self.h3index_destination.append
+        append_travel_duration = self.travel_duration_secs.append
+        append_edge_preference = self.edge_preference.append
+        append_path_length = self.path_length_m.append
+        append_wkb = self.wkbs.append
+        for route in routes:
+            append_origin(route.origin_cell)
+            append_destination(route.destination_cell)
+            append_travel_duration(route.travel_duration_secs)
+            append_edge_preference(route.edge_preference)
+            append_path_length(route.path_length_m)
+            append_wkb(route.wkb)
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        """the columns as numpy arrays. The numeric columns are zero-copy views on the buffers."""
+        return {
+            "geometry": shapely.from_wkb(self.wkbs),
+            "h3index_origin": np.frombuffer(self.h3index_origin, dtype=np.uint64),
+            "h3index_destination": np.frombuffer(self.h3index_destination, dtype=np.uint64),
+            "travel_duration_secs": np.frombuffer(self.travel_duration_secs, dtype=np.float64),
+            "edge_preference": np.frombuffer(self.edge_preference, dtype=np.float64),
+            "path_length_m": np.frombuffer(self.path_length_m, dtype=np.float64),
+        }
+
+
 def _h3_shortest_path_linestrings_gdf(gen: typing.Generator[RouteWKB, None, None]) -> "GeoDataFrame":
     from geopandas import GeoDataFrame
-    import numpy as np
-
-    geoms = []
-    h3index_origin = []
-    h3index_destination = []
-    travel_duration_secs = []
-    edge_preference = []
-    path_length_m = []
-
-    for route in gen:
-        h3index_origin.append(route.origin_cell)
-        h3index_destination.append(route.destination_cell)
-        travel_duration_secs.append(route.travel_duration_secs)
-        edge_preference.append(route.edge_preference)
-        path_length_m.append(route.path_length_m)
-        geoms.append(shapely.wkb.loads(route.wkb))
-
-    gdf = GeoDataFrame({
-        "geometry": geoms,
-        "h3index_origin": np.asarray(h3index_origin, dtype=np.uint64),
-        "h3index_destination": np.asarray(h3index_destination, dtype=np.uint64),
-        "travel_duration_secs": np.asarray(travel_duration_secs, dtype=np.float64),
-        "edge_preference": np.asarray(edge_preference, dtype=np.float64),
-        "path_length_m": np.asarray(path_length_m, dtype=np.float64),
-    }, crs=4326)
-    return gdf
+
+    columns = _RouteWKBColumns()
+    columns.extend(gen)
+    return GeoDataFrame(columns.to_dict(), crs=4326)
 
 
 def _get_differential_shortest_path_routes_gdf(
         response: rout3serv_pb2.DifferentialShortestPathRoutes) -> "GeoDataFrame":
     from geopandas import GeoDataFrame
-    import numpy as np
-
-    geoms = []
-    h3index_origin = []
-    h3index_destination = []
-    travel_duration_secs = []
-    edge_preference = []
-    with_disturbance_list = []
+
+    columns = _RouteWKBColumns()
+    with_disturbance_list = array.array("B")
     for stream_item in response:
         for with_disturbance, route_list in (
                 (1, stream_item.routes_with_disturbance), (0, stream_item.routes_without_disturbance)):
-            for route in route_list:
-                h3index_origin.append(route.origin_cell)
-                h3index_destination.append(route.destination_cell)
-                with_disturbance_list.append(with_disturbance)
-                travel_duration_secs.append(route.travel_duration_secs)
-                edge_preference.append(route.edge_preference)
-                geoms.append(shapely.wkb.loads(route.wkb))
-
-    gdf = GeoDataFrame({
-        "geometry": geoms,
-        "h3index_origin": np.asarray(h3index_origin, dtype=np.uint64),
-        "h3index_destination": np.asarray(h3index_destination, dtype=np.uint64),
-        "travel_duration_secs": np.asarray(travel_duration_secs, dtype=np.float64),
-        "edge_preference": np.asarray(edge_preference, dtype=np.float64),
-        "with_disturbance": np.asarray(with_disturbance_list, dtype=np.uint),
-    }, crs=4326)
-    return gdf
+            # the flag is constant for all routes of the list
+            with_disturbance_list.extend(array.array("B", (with_disturbance,)) * len(route_list))
+            columns.extend(route_list)
+
+    data = columns.to_dict()
+    data["with_disturbance"] = np.frombuffer(with_disturbance_list, dtype=np.uint8)
+    return GeoDataFrame(data, crs=4326)
@@ -2,10 +2,9 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: rout3serv.proto
 """Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
 from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
@@ -14,147 +13,10 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0frout3serv.proto\x12\trout3serv\"\x07\n\x05\x45mpty\"S\n\x0fVersionResponse\x12\x0f\n\x07version\x18\x01 \x01(\t\x12\x16\n\x0egit_commit_sha\x18\x02 \x01(\t\x12\x17\n\x0f\x62uild_timestamp\x18\x03 \x01(\t\"\x1d\n\x05Point\x12\t\n\x01x\x18\x01 \x01(\x01\x12\t\n\x01y\x18\x02 \x01(\x01\"X\n\x13ShortestPathOptions\x12!\n\x19num_destinations_to_reach\x18\x04 \x01(\r\x12\x1e\n\x16num_gap_cells_to_graph\x18\x06 \x01(\r\"\xb1\x02\n\x1f\x44ifferentialShortestPathRequest\x12,\n\x0cgraph_handle\x18\x01 \x01(\x0b\x32\x16.rout3serv.GraphHandle\x12 \n\x18\x64isturbance_wkb_geometry\x18\x02 \x01(\x0c\x12\x15\n\rradius_meters\x18\x03 \x01(\x01\x12/\n\x07options\x18\x04 \x01(\x0b\x32\x1e.rout3serv.ShortestPathOptions\x12&\n\x0c\x64\x65stinations\x18\x05 \x03(\x0b\x32\x10.rout3serv.Point\x12\x1e\n\x16\x64ownsampled_prerouting\x18\x06 \x01(\x08\x12\x14\n\x0cstore_output\x18\x07 \x01(\x08\x12\x18\n\x10ref_dataset_name\x18\x08 \x01(\t\"\x1a\n\x05IdRef\x12\x11\n\tobject_id\x18\x01 \x01(\t\"4\n\rCellSelection\x12\r\n\x05\x63\x65lls\x18\x01 \x03(\x04\x12\x14\n\x0c\x64\x61taset_name\x18\x02 \x01(\t\"f\n%DifferentialShortestPathRoutesRequest\x12\x11\n\tobject_id\x18\x01 \x01(\t\x12\x1b\n\x13smoothen_geometries\x18\x02 \x01(\x08\x12\r\n\x05\x63\x65lls\x18\x03 \x03(\x04\"\x94\x01\n\x08RouteWKB\x12\x13\n\x0borigin_cell\x18\x01 \x01(\x04\x12\x18\n\x10\x64\x65stination_cell\x18\x02 \x01(\x04\x12\x1c\n\x14travel_duration_secs\x18\x03 \x01(\x01\x12\x17\n\x0f\x65\x64ge_preference\x18\x04 \x01(\x01\x12\x0b\n\x03wkb\x18\x05 \x01(\x0c\x12\x15\n\rpath_length_m\x18\x06 \x01(\x01\"\xa0\x01\n\x0eRouteH3Indexes\x12\x13\n\x0borigin_cell\x18\x01 \x01(\x04\x12\x18\n\x10\x64\x65stination_cell\x18\x02 \x01(\x04\x12\x1c\n\x14travel_duration_secs\x18\x03 \x01(\x01\x12\x17\n\x0f\x65\x64ge_preference\x18\x04 \x01(\x01\x12\x11\n\th3indexes\x18\x05 \x03(\x04\x12\x15\n\rpath_length_m\x18\x06 \x01(\x01\"\x84\x02\n\x15H3ShortestPathRequest\x12,\n\x0cgraph_handle\x18\x01 \x01(\x0b\x32\x16.rout3serv.GraphHandle\x12)\n\x07origins\x18\x02 \x01(\x0b\x32\x18.rout3serv.CellSelection\x12.\n\x0c\x64\x65stinations\x18\x03 \x01(\x0b\x32\x18.rout3serv.CellSelection\x12/\n\x07options\x18\x04 \x01(\x0b\x32\x1e.rout3serv.ShortestPathOptions\x12\x1b\n\x13smoothen_geometries\x18\x05 \x01(\x08\x12\x14\n\x0crouting_mode\x18\x06 \x01(\t\"0\n\rArrowIPCChunk\x12\x11\n\tobject_id\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\"\x8f\x01\n\x1e\x44ifferentialShortestPathRoutes\x12\x37\n\x1aroutes_without_disturbance\x18\x02 \x03(\x0b\x32\x13.rout3serv.RouteWKB\x12\x34\n\x17routes_with_disturbance\x18\x03 \x03(\x0b\x32\x13.rout3serv.RouteWKB\"2\n\x0bGraphHandle\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x15\n\rh3_resolution\x18\x02 \x01(\r\"<\n\x12ListGraphsResponse\x12&\n\x06graphs\x18\x01 \x03(\x0b\x32\x16.rout3serv.GraphHandle\",\n\x14ListDatasetsResponse\x12\x14\n\x0c\x64\x61taset_name\x18\x01 \x03(\t\"\xb1\x01\n\x18H3WithinThresholdRequest\x12,\n\x0cgraph_handle\x18\x01 \x01(\x0b\x32\x16.rout3serv.GraphHandle\x12)\n\x07origins\x18\x02 \x01(\x0b\x32\x18.rout3serv.CellSelection\x12&\n\x1etravel_duration_secs_threshold\x18\x03 \x01(\x02\x12\x14\n\x0crouting_mode\x18\x04 \x01(\t2\xb0\x07\n\tRout3Serv\x12\x39\n\x07Version\x12\x10.rout3serv.Empty\x1a\x1a.rout3serv.VersionResponse\"\x00\x12?\n\nListGraphs\x12\x10.rout3serv.Empty\x1a\x1d.rout3serv.ListGraphsResponse\"\x00\x12\x43\n\x0cListDatasets\x12\x10.rout3serv.Empty\x1a\x1f.rout3serv.ListDatasetsResponse\"\x00\x12N\n\x0eH3ShortestPath\x12 .rout3serv.H3ShortestPathRequest\x1a\x18.rout3serv.ArrowIPCChunk0\x01\x12O\n\x14H3ShortestPathRoutes\x12 .rout3serv.H3ShortestPathRequest\x1a\x13.rout3serv.RouteWKB0\x01\x12T\n\x13H3ShortestPathCells\x12 .rout3serv.H3ShortestPathRequest\x1a\x19.rout3serv.RouteH3Indexes0\x01\x12T\n\x13H3ShortestPathEdges\x12 .rout3serv.H3ShortestPathRequest\x1a\x19.rout3serv.RouteH3Indexes0\x01\x12\x64\n\x18\x44ifferentialShortestPath\x12*.rout3serv.DifferentialShortestPathRequest\x1a\x18.rout3serv.ArrowIPCChunk\"\x00\x30\x01\x12M\n\x1bGetDifferentialShortestPath\x12\x10.rout3serv.IdRef\x1a\x18.rout3serv.ArrowIPCChunk\"\x00\x30\x01\x12\x84\x01\n!GetDifferentialShortestPathRoutes\x12\x30.rout3serv.DifferentialShortestPathRoutesRequest\x1a).rout3serv.DifferentialShortestPathRoutes\"\x00\x30\x01\x12Y\n\x16H3CellsWithinThreshold\x12#.rout3serv.H3WithinThresholdRequest\x1a\x18.rout3serv.ArrowIPCChunk0\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0frout3serv.proto\x12\trout3serv\"\x07\n\x05\x45mpty\"S\n\x0fVersionResponse\x12\x0f\n\x07version\x18\x01 \x01(\t\x12\x16\n\x0egit_commit_sha\x18\x02 \x01(\t\x12\x17\n\x0f\x62uild_timestamp\x18\x03 \x01(\t\"\x1d\n\x05Point\x12\t\n\x01x\x18\x01 \x01(\x01\x12\t\n\x01y\x18\x02 \x01(\x01\"X\n\x13ShortestPathOptions\x12!\n\x19num_destinations_to_reach\x18\x04 \x01(\r\x12\x1e\n\x16num_gap_cells_to_graph\x18\x06 \x01(\r\"\xcc\x02\n\x1f\x44ifferentialShortestPathRequest\x12,\n\x0cgraph_handle\x18\x01 \x01(\x0b\x32\x16.rout3serv.GraphHandle\x12 \n\x18\x64isturbance_wkb_geometry\x18\x02 \x01(\x0c\x12\x15\n\rradius_meters\x18\x03 \x01(\x01\x12/\n\x07options\x18\x04 \x01(\x0b\x32\x1e.rout3serv.ShortestPathOptions\x12&\n\x0c\x64\x65stinations\x18\x05 \x03(\x0b\x32\x10.rout3serv.Point\x12\x1e\n\x16\x64ownsampled_prerouting\x18\x06 \x01(\x08\x12\x14\n\x0cstore_output\x18\x07 \x01(\x08\x12\x18\n\x10ref_dataset_name\x18\x08 \x01(\t\x12\x19\n\x11\x64\x65stination_cells\x18\t \x03(\x06\"\x1a\n\x05IdRef\x12\x11\n\tobject_id\x18\x01 \x01(\t\"J\n\rCellSelection\x12\r\n\x05\x63\x65lls\x18\x03 \x03(\x06\x12\x14\n\x0clegacy_cells\x18\x01 \x03(\x04\x12\x14\n\x0c\x64\x61taset_name\x18\x02 \x01(\t\"|\n%DifferentialShortestPathRoutesRequest\x12\x11\n\tobject_id\x18\x01 \x01(\t\x12\x1b\n\x13smoothen_geometries\x18\x02 \x01(\x08\x12\r\n\x05\x63\x65lls\x18\x04 \x03(\x06\x12\x14\n\x0clegacy_cells\x18\x03 \x03(\x04\"\xa0\x01\n\x08RouteWKB\x12\x13\n\x0borigin_cell\x18\x07 \x01(\x06\x12\x18\n\x10\x64\x65stination_cell\x18\x08 \x01(\x06\x12\x1c\n\x14travel_duration_secs\x18\x03 \x01(\x01\x12\x17\n\x0f\x65\x64ge_preference\x18\x04 \x01(\x01\x12\x0b\n\x03wkb\x18\x05 \x01(\x0c\x12\x15\n\rpath_length_m\x18\x06 \x01(\x01J\x04\x08\x01\x10\x02J\x04\x08\x02\x10\x03\"\xb2\x01\n\x0eRouteH3Indexes\x12\x13\n\x0borigin_cell\x18\x07 \x01(\x06\x12\x18\n\x10\x64\x65stination_cell\x18\x08 \x01(\x06\x12\x1c\n\x14travel_duration_secs\x18\x03 \x01(\x01\x12\x17\n\x0f\x65\x64ge_preference\x18\x04 \x01(\x01\x12\x11\n\th3indexes\x18\t \x03(\x06\x12\x15\n\rpath_length_m\x18\x06 \x01(\x01J\x04\x08\x01\x10\x02J\x04\x08\x02\x10\x03J\x04\x08\x05\x10\x06\"\x84\x02\n\x15H3ShortestPathRequest\x12,\n\x0cgraph_handle\x18\x01 \x01(\x0b\x32\x16.rout3serv.GraphHandle\x12)\n\x07origins\x18\x02 \x01(\x0b\x32\x18.rout3serv.CellSelection\x12.\n\x0c\x64\x65stinations\x18\x03 \x01(\x0b\x32\x18.rout3serv.CellSelection\x12/\n\x07options\x18\x04 \x01(\x0b\x32\x1e.rout3serv.ShortestPathOptions\x12\x1b\n\x13smoothen_geometries\x18\x05 \x01(\x08\x12\x14\n\x0crouting_mode\x18\x06 \x01(\t\"Q\n\rArrowIPCChunk\x12\x11\n\tobject_id\x18\x01 \x01(\t\x12\x0e\n\x04\x64\x61ta\x18\x02 \x01(\x0cH\x00\x12\x12\n\x08shm_path\x18\x03 \x01(\tH\x00\x42\t\n\x07payload\"P\n\x1aH3ShortestPathBatchRequest\x12\x32\n\x08requests\x18\x01 \x03(\x0b\x32 .rout3serv.H3ShortestPathRequest\"v\n\x18H3ShortestPathBatchChunk\x12\x13\n\x0b\x62\x61tch_index\x18\x01 \x01(\r\x12)\n\x05\x63hunk\x18\x02 \x01(\x0b\x32\x18.rout3serv.ArrowIPCChunkH\x00\x12\x0f\n\x05\x65rror\x18\x03 \x01(\tH\x00\x42\t\n\x07payload\"\x8f\x01\n\x1e\x44ifferentialShortestPathRoutes\x12\x37\n\x1aroutes_without_disturbance\x18\x02 \x03(\x0b\x32\x13.rout3serv.RouteWKB\x12\x34\n\x17routes_with_disturbance\x18\x03 \x03(\x0b\x32\x13.rout3serv.RouteWKB\"2\n\x0bGraphHandle\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x15\n\rh3_resolution\x18\x02 \x01(\r\"<\n\x12ListGraphsResponse\x12&\n\x06graphs\x18\x01 \x03(\x0b\x32\x16.rout3serv.GraphHandle\",\n\x14ListDatasetsResponse\x12\x14\n\x0c\x64\x61taset_name\x18\x01 \x03(\t\"\xb1\x01\n\x18H3WithinThresholdRequest\x12,\n\x0cgraph_handle\x18\x01 \x01(\x0b\x32\x16.rout3serv.GraphHandle\x12)\n\x07origins\x18\x02 \x01(\x0b\x32\x18.rout3serv.CellSelection\x12&\n\x1etravel_duration_secs_threshold\x18\x03 \x01(\x02\x12\x14\n\x0crouting_mode\x18\x04 \x01(\t2\x97\x08\n\tRout3Serv\x12\x39\n\x07Version\x12\x10.rout3serv.Empty\x1a\x1a.rout3serv.VersionResponse\"\x00\x12?\n\nListGraphs\x12\x10.rout3serv.Empty\x1a\x1d.rout3serv.ListGraphsResponse\"\x00\x12\x43\n\x0cListDatasets\x12\x10.rout3serv.Empty\x1a\x1f.rout3serv.ListDatasetsResponse\"\x00\x12N\n\x0eH3ShortestPath\x12 .rout3serv.H3ShortestPathRequest\x1a\x18.rout3serv.ArrowIPCChunk0\x01\x12O\n\x14H3ShortestPathRoutes\x12 .rout3serv.H3ShortestPathRequest\x1a\x13.rout3serv.RouteWKB0\x01\x12T\n\x13H3ShortestPathCells\x12 .rout3serv.H3ShortestPathRequest\x1a\x19.rout3serv.RouteH3Indexes0\x01\x12T\n\x13H3ShortestPathEdges\x12 .rout3serv.H3ShortestPathRequest\x1a\x19.rout3serv.RouteH3Indexes0\x01\x12\x65\n\x15H3ShortestPathBatched\x12%.rout3serv.H3ShortestPathBatchRequest\x1a#.rout3serv.H3ShortestPathBatchChunk0\x01\x12\x64\n\x18\x44ifferentialShortestPath\x12*.rout3serv.DifferentialShortestPathRequest\x1a\x18.rout3serv.ArrowIPCChunk\"\x00\x30\x01\x12M\n\x1bGetDifferentialShortestPath\x12\x10.rout3serv.IdRef\x1a\x18.rout3serv.ArrowIPCChunk\"\x00\x30\x01\x12\x84\x01\n!GetDifferentialShortestPathRoutes\x12\x30.rout3serv.DifferentialShortestPathRoutesRequest\x1a).rout3serv.DifferentialShortestPathRoutes\"\x00\x30\x01\x12Y\n\x16H3CellsWithinThreshold\x12#.rout3serv.H3WithinThresholdRequest\x1a\x18.rout3serv.ArrowIPCChunk0\x01\x62\x06proto3')
 
-
-
-_EMPTY = DESCRIPTOR.message_types_by_name['Empty']
-_VERSIONRESPONSE = DESCRIPTOR.message_types_by_name['VersionResponse']
-_POINT = DESCRIPTOR.message_types_by_name['Point']
-_SHORTESTPATHOPTIONS = DESCRIPTOR.message_types_by_name['ShortestPathOptions']
-_DIFFERENTIALSHORTESTPATHREQUEST = DESCRIPTOR.message_types_by_name['DifferentialShortestPathRequest']
-_IDREF = DESCRIPTOR.message_types_by_name['IdRef']
-_CELLSELECTION = DESCRIPTOR.message_types_by_name['CellSelection']
-_DIFFERENTIALSHORTESTPATHROUTESREQUEST = DESCRIPTOR.message_types_by_name['DifferentialShortestPathRoutesRequest']
-_ROUTEWKB = DESCRIPTOR.message_types_by_name['RouteWKB']
-_ROUTEH3INDEXES = DESCRIPTOR.message_types_by_name['RouteH3Indexes']
-_H3SHORTESTPATHREQUEST = DESCRIPTOR.message_types_by_name['H3ShortestPathRequest']
-_ARROWIPCCHUNK = DESCRIPTOR.message_types_by_name['ArrowIPCChunk']
-_DIFFERENTIALSHORTESTPATHROUTES = DESCRIPTOR.message_types_by_name['DifferentialShortestPathRoutes']
-_GRAPHHANDLE = DESCRIPTOR.message_types_by_name['GraphHandle']
-_LISTGRAPHSRESPONSE = DESCRIPTOR.message_types_by_name['ListGraphsResponse']
-_LISTDATASETSRESPONSE = DESCRIPTOR.message_types_by_name['ListDatasetsResponse']
-_H3WITHINTHRESHOLDREQUEST = DESCRIPTOR.message_types_by_name['H3WithinThresholdRequest']
-Empty = _reflection.GeneratedProtocolMessageType('Empty', (_message.Message,), {
-  'DESCRIPTOR' : _EMPTY,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.Empty)
-  })
-_sym_db.RegisterMessage(Empty)
-
-VersionResponse = _reflection.GeneratedProtocolMessageType('VersionResponse', (_message.Message,), {
-  'DESCRIPTOR' : _VERSIONRESPONSE,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.VersionResponse)
-  })
-_sym_db.RegisterMessage(VersionResponse)
-
-Point = _reflection.GeneratedProtocolMessageType('Point', (_message.Message,), {
-  'DESCRIPTOR' : _POINT,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.Point)
-  })
-_sym_db.RegisterMessage(Point)
-
-ShortestPathOptions = _reflection.GeneratedProtocolMessageType('ShortestPathOptions', (_message.Message,), {
-  'DESCRIPTOR' : _SHORTESTPATHOPTIONS,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.ShortestPathOptions)
-  })
-_sym_db.RegisterMessage(ShortestPathOptions)
-
-DifferentialShortestPathRequest = _reflection.GeneratedProtocolMessageType('DifferentialShortestPathRequest', (_message.Message,), {
-  'DESCRIPTOR' : _DIFFERENTIALSHORTESTPATHREQUEST,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.DifferentialShortestPathRequest)
-  })
-_sym_db.RegisterMessage(DifferentialShortestPathRequest)
-
-IdRef = _reflection.GeneratedProtocolMessageType('IdRef', (_message.Message,), {
-  'DESCRIPTOR' : _IDREF,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.IdRef)
-  })
-_sym_db.RegisterMessage(IdRef)
-
-CellSelection = _reflection.GeneratedProtocolMessageType('CellSelection', (_message.Message,), {
-  'DESCRIPTOR' : _CELLSELECTION,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.CellSelection)
-  })
-_sym_db.RegisterMessage(CellSelection)
-
-DifferentialShortestPathRoutesRequest = _reflection.GeneratedProtocolMessageType('DifferentialShortestPathRoutesRequest', (_message.Message,), {
-  'DESCRIPTOR' : _DIFFERENTIALSHORTESTPATHROUTESREQUEST,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.DifferentialShortestPathRoutesRequest)
-  })
-_sym_db.RegisterMessage(DifferentialShortestPathRoutesRequest)
-
-RouteWKB = _reflection.GeneratedProtocolMessageType('RouteWKB', (_message.Message,), {
-  'DESCRIPTOR' : _ROUTEWKB,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.RouteWKB)
-  })
-_sym_db.RegisterMessage(RouteWKB)
-
-RouteH3Indexes = _reflection.GeneratedProtocolMessageType('RouteH3Indexes', (_message.Message,), {
-  'DESCRIPTOR' : _ROUTEH3INDEXES,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.RouteH3Indexes)
-  })
-_sym_db.RegisterMessage(RouteH3Indexes)
-
-H3ShortestPathRequest = _reflection.GeneratedProtocolMessageType('H3ShortestPathRequest', (_message.Message,), {
-  'DESCRIPTOR' : _H3SHORTESTPATHREQUEST,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.H3ShortestPathRequest)
-  })
-_sym_db.RegisterMessage(H3ShortestPathRequest)
-
-ArrowIPCChunk = _reflection.GeneratedProtocolMessageType('ArrowIPCChunk', (_message.Message,), {
-  'DESCRIPTOR' : _ARROWIPCCHUNK,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.ArrowIPCChunk)
-  })
-_sym_db.RegisterMessage(ArrowIPCChunk)
-
-DifferentialShortestPathRoutes = _reflection.GeneratedProtocolMessageType('DifferentialShortestPathRoutes', (_message.Message,), {
-  'DESCRIPTOR' : _DIFFERENTIALSHORTESTPATHROUTES,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.DifferentialShortestPathRoutes)
-  })
-_sym_db.RegisterMessage(DifferentialShortestPathRoutes)
-
-GraphHandle = _reflection.GeneratedProtocolMessageType('GraphHandle', (_message.Message,), {
-  'DESCRIPTOR' : _GRAPHHANDLE,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.GraphHandle)
-  })
-_sym_db.RegisterMessage(GraphHandle)
-
-ListGraphsResponse = _reflection.GeneratedProtocolMessageType('ListGraphsResponse', (_message.Message,), {
-  'DESCRIPTOR' : _LISTGRAPHSRESPONSE,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.ListGraphsResponse)
-  })
-_sym_db.RegisterMessage(ListGraphsResponse)
-
-ListDatasetsResponse = _reflection.GeneratedProtocolMessageType('ListDatasetsResponse', (_message.Message,), {
-  'DESCRIPTOR' : _LISTDATASETSRESPONSE,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.ListDatasetsResponse)
-  })
-_sym_db.RegisterMessage(ListDatasetsResponse)
-
-H3WithinThresholdRequest = _reflection.GeneratedProtocolMessageType('H3WithinThresholdRequest', (_message.Message,), {
-  'DESCRIPTOR' : _H3WITHINTHRESHOLDREQUEST,
-  '__module__' : 'rout3serv_pb2'
-  # @@protoc_insertion_point(class_scope:rout3serv.H3WithinThresholdRequest)
-  })
-_sym_db.RegisterMessage(H3WithinThresholdRequest)
-
-_ROUT3SERV = DESCRIPTOR.services_by_name['Rout3Serv']
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'rout3serv_pb2', globals())
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
@@ -167,31 +29,35 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _SHORTESTPATHOPTIONS._serialized_start=155
   _SHORTESTPATHOPTIONS._serialized_end=243
   _DIFFERENTIALSHORTESTPATHREQUEST._serialized_start=246
-  _DIFFERENTIALSHORTESTPATHREQUEST._serialized_end=551
-  _IDREF._serialized_start=553
-  _IDREF._serialized_end=579
-  _CELLSELECTION._serialized_start=581
-  _CELLSELECTION._serialized_end=633
-  _DIFFERENTIALSHORTESTPATHROUTESREQUEST._serialized_start=635
-  _DIFFERENTIALSHORTESTPATHROUTESREQUEST._serialized_end=737
-  _ROUTEWKB._serialized_start=740
-  _ROUTEWKB._serialized_end=888
-  _ROUTEH3INDEXES._serialized_start=891
-  _ROUTEH3INDEXES._serialized_end=1051
-  _H3SHORTESTPATHREQUEST._serialized_start=1054
-  _H3SHORTESTPATHREQUEST._serialized_end=1314
-  _ARROWIPCCHUNK._serialized_start=1316
-  _ARROWIPCCHUNK._serialized_end=1364
-  _DIFFERENTIALSHORTESTPATHROUTES._serialized_start=1367
-  _DIFFERENTIALSHORTESTPATHROUTES._serialized_end=1510
-  _GRAPHHANDLE._serialized_start=1512
-  _GRAPHHANDLE._serialized_end=1562
-  _LISTGRAPHSRESPONSE._serialized_start=1564
-  _LISTGRAPHSRESPONSE._serialized_end=1624
-  _LISTDATASETSRESPONSE._serialized_start=1626
-  _LISTDATASETSRESPONSE._serialized_end=1670
-  _H3WITHINTHRESHOLDREQUEST._serialized_start=1673
-  _H3WITHINTHRESHOLDREQUEST._serialized_end=1850
-  _ROUT3SERV._serialized_start=1853
-  _ROUT3SERV._serialized_end=2797
+  _DIFFERENTIALSHORTESTPATHREQUEST._serialized_end=578
+  _IDREF._serialized_start=580
+  _IDREF._serialized_end=606
+  _CELLSELECTION._serialized_start=608
+  _CELLSELECTION._serialized_end=682
+  _DIFFERENTIALSHORTESTPATHROUTESREQUEST._serialized_start=684
+  _DIFFERENTIALSHORTESTPATHROUTESREQUEST._serialized_end=808
+  _ROUTEWKB._serialized_start=811
+  _ROUTEWKB._serialized_end=971
+  _ROUTEH3INDEXES._serialized_start=974
+  _ROUTEH3INDEXES._serialized_end=1152
+  _H3SHORTESTPATHREQUEST._serialized_start=1155
+  _H3SHORTESTPATHREQUEST._serialized_end=1415
+  _ARROWIPCCHUNK._serialized_start=1417
+  _ARROWIPCCHUNK._serialized_end=1498
+  _H3SHORTESTPATHBATCHREQUEST._serialized_start=1500
+  _H3SHORTESTPATHBATCHREQUEST._serialized_end=1580
+  _H3SHORTESTPATHBATCHCHUNK._serialized_start=1582
+  _H3SHORTESTPATHBATCHCHUNK._serialized_end=1700
+  _DIFFERENTIALSHORTESTPATHROUTES._serialized_start=1703
+  _DIFFERENTIALSHORTESTPATHROUTES._serialized_end=1846
+  _GRAPHHANDLE._serialized_start=1848
+  _GRAPHHANDLE._serialized_end=1898
+  _LISTGRAPHSRESPONSE._serialized_start=1900
+  _LISTGRAPHSRESPONSE._serialized_end=1960
+  _LISTDATASETSRESPONSE._serialized_start=1962
+  _LISTDATASETSRESPONSE._serialized_end=2006
+  _H3WITHINTHRESHOLDREQUEST._serialized_start=2009
+  _H3WITHINTHRESHOLDREQUEST._serialized_end=2186
+  _ROUT3SERV._serialized_start=2189
+  _ROUT3SERV._serialized_end=3236
 # @@protoc_insertion_point(module_scope)
@@ -49,6 +49,11 @@ class Rout3ServStub(object):
                 request_serializer=rout3serv_pb2.H3ShortestPathRequest.SerializeToString,
                 response_deserializer=rout3serv_pb2.RouteH3Indexes.FromString,
                 )
+        self.H3ShortestPathBatched = channel.unary_stream(
+                '/rout3serv.Rout3Serv/H3ShortestPathBatched',
+                request_serializer=rout3serv_pb2.H3ShortestPathBatchRequest.SerializeToString,
+                response_deserializer=rout3serv_pb2.H3ShortestPathBatchChunk.FromString,
+                )
         self.DifferentialShortestPath = channel.unary_stream(
                 '/rout3serv.Rout3Serv/DifferentialShortestPath',
                 request_serializer=rout3serv_pb2.DifferentialShortestPathRequest.SerializeToString,
@@ -118,6 +123,13 @@ class Rout3ServServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def H3ShortestPathBatched(self, request, context):
+        """* many shortest path requests in a single call. The results are streamed one request after the other 
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def DifferentialShortestPath(self, request, context):
         """* differential shortest path based on the population dataset 
         """
@@ -182,6 +194,11 @@ def add_Rout3ServServicer_to_server(servicer, server):
                     request_deserializer=rout3serv_pb2.H3ShortestPathRequest.FromString,
                     response_serializer=rout3serv_pb2.RouteH3Indexes.SerializeToString,
             ),
+            'H3ShortestPathBatched': grpc.unary_stream_rpc_method_handler(
+                    servicer.H3ShortestPathBatched,
+                    request_deserializer=rout3serv_pb2.H3ShortestPathBatchRequest.FromString,
+                    response_serializer=rout3serv_pb2.H3ShortestPathBatchChunk.SerializeToString,
+            ),
             'DifferentialShortestPath': grpc.unary_stream_rpc_method_handler(
                     servicer.DifferentialShortestPath,
                     request_deserializer=rout3serv_pb2.DifferentialShortestPathRequest.FromString,
@@ -331,6 +348,23 @@ class Rout3Serv(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def H3ShortestPathBatched(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/rout3serv.Rout3Serv/H3ShortestPathBatched',
+            rout3serv_pb2.H3ShortestPathBatchRequest.SerializeToString,
+            rout3serv_pb2.H3ShortestPathBatchChunk.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def DifferentialShortestPath(request,
             target,
@@ -0,0 +1,125 @@
+import asyncio
+from concurrent import futures
+
+import grpc
+import pyarrow as pa
+import pytest
+
+import rout3serv
+from rout3serv import rout3serv_pb2, rout3serv_pb2_grpc
+
+
+def ipc_file_bytes(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class FakeRout3Serv(rout3serv_pb2_grpc.Rout3ServServicer):
+    """routes every origin to every destination. Responds with chunks of at most two rows.
+
+    The stored differential shortest path "empty" has no chunks, "schema-only" is a single
+    chunk without any batches."""
+
+    def GetDifferentialShortestPath(self, request, context):
+        if request.object_id == "schema-only":
+            schema = pa.schema([("h3index_cell", pa.uint64())])
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_file(sink, schema):
+                pass
+            yield rout3serv_pb2.ArrowIPCChunk(object_id=request.object_id, data=sink.getvalue().to_pybytes())
+
+    def H3ShortestPath(self, request, context):
+        if not request.origins.cells:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "no origins")
+        yield from self._shortest_path_chunks(request)
+
+    def H3ShortestPathBatched(self, request, context):
+        for batch_index, single_request in enumerate(request.requests):
+            if not single_request.origins.cells:
+                yield rout3serv_pb2.H3ShortestPathBatchChunk(batch_index=batch_index, error="no origins")
+                continue
+            for chunk in self._shortest_path_chunks(single_request):
+                yield rout3serv_pb2.H3ShortestPathBatchChunk(batch_index=batch_index, chunk=chunk)
+
+    @staticmethod
+    def _shortest_path_chunks(request):
+        origins = [o for o in request.origins.cells for _ in request.destinations.cells]
+        destinations = [d for _ in request.origins.cells for d in request.destinations.cells]
+        table = pa.table({
+            "h3index_cell_origin": pa.array(origins, pa.uint64()),
+            "h3index_cell_destination": pa.array(destinations, pa.uint64()),
+            "travel_duration_secs": pa.array([float(o % 100 + d % 100) for o, d in zip(origins, destinations)]),
+        })
+        for offset in range(0, table.num_rows, 2):
+            yield rout3serv_pb2.ArrowIPCChunk(object_id="obj", data=ipc_file_bytes(table.slice(offset, 2)))
+
+
+@pytest.fixture
+def hostport():
+    grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    rout3serv_pb2_grpc.add_Rout3ServServicer_to_server(FakeRout3Serv(), grpc_server)
+    port = grpc_server.add_insecure_port("127.0.0.1:0")
+    grpc_server.start()
+    yield f"127.0.0.1:{port}"
+    grpc_server.stop(None)
+
+
+@pytest.fixture
+def server(hostport):
+    return rout3serv.Server(hostport)
+
+
+def test_h3_shortest_path_batched_matches_individual_requests(server):
+    graph_handle = rout3serv.build_graph_handle("graph", 7)
+    requests = [
+        rout3serv.build_h3_shortest_path_request(graph_handle, [1, 2, 3], [10, 11]),
+        rout3serv.build_h3_shortest_path_request(graph_handle, [3, 4], [12]),
+        rout3serv.build_h3_shortest_path_request(graph_handle, [5], [1, 2, 13]),
+    ]
+
+    batched = server.h3_shortest_path_batched(requests)
+
+    assert len(batched) == len(requests)
+    for request, result in zip(requests, batched):
+        assert result.table.equals(server.h3_shortest_path(request).table)
+
+
+def test_h3_shortest_path_batched_isolates_failed_requests(server):
+    graph_handle = rout3serv.build_graph_handle("graph", 7)
+    requests = [
+        rout3serv.build_h3_shortest_path_request(graph_handle, [], [10]),
+        rout3serv.build_h3_shortest_path_request(graph_handle, [1], [10]),
+    ]
+
+    batched = server.h3_shortest_path_batched(requests)
+
+    assert isinstance(batched[0], rout3serv.RequestError)
+    assert batched[1].table.equals(server.h3_shortest_path(requests[1]).table)
+
+
+def test_h3_shortest_path_batched_empty(server):
+    assert server.h3_shortest_path_batched([]) == []
+
+
+def get_differential_shortest_path_async(hostport, object_id):
+    async def get():
+        async with rout3serv.AsyncServer(hostport) as server:
+            return await server.get_differential_shortest_path(object_id)
+
+    return asyncio.run(get())
+
+
+def test_no_chunks(hostport, server):
+    for result in (server.get_differential_shortest_path("empty"),
+                   get_differential_shortest_path_async(hostport, "empty")):
+        assert result.table is None
+
+
+def test_zero_batches(hostport, server):
+    for result in (server.get_differential_shortest_path("schema-only"),
+                   get_differential_shortest_path_async(hostport, "schema-only")):
+        assert result.id == "schema-only"
+        assert result.table.num_rows == 0
+        assert result.table.schema == pa.schema([("h3index_cell", pa.uint64())])
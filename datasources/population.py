@@ -3,14 +3,13 @@ pulls data from facebooks Data for good Population density maps
 
 https://dataforgood.fb.com/tools/population-density-maps/
 """
-import os
-import tempfile
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 
 import click
 import geojson
-import geopandas as gpd
 import h3.api.numpy_int as h3
+import h3.unstable.vect as h3vect
 import h3ronpy.raster
 import numpy as np
 import pandas as pd
@@ -20,9 +19,8 @@ import rasterio
 import rasterio.windows
 import shapely.ops
 from h3ronpy.util import dataframe_to_geodataframe
-from h3ronpy.vector import geodataframe_to_h3
 from pyarrow.fs import LocalFileSystem
-from shapely.geometry import shape
+from shapely.geometry import mapping, shape
 
 # datasets are in WGS84, so no reprojection required
 
@@ -37,75 +35,111 @@ DATASETS = (
 )
 
 
-def fetch_dataset(dataset_name: str, bounds: List[float], conversion_h3_res: Optional[int] = None) -> (
-        pd.DataFrame, int):
-    filename = f"/vsis3/dataforgood-fb-data/hrsl-cogs/{dataset_name}/{dataset_name}-latest.vrt"
+# the GDAL environment is per thread, so each fetch opens its own one using these options
+GDAL_ENV_OPTIONS = dict(
+    AWS_NO_SIGN_REQUEST="YES",
+    # merge the range requests for neighbouring COG tiles and multiplex them over HTTP/2
+    GDAL_HTTP_MULTIPLEX="YES",
+    GDAL_HTTP_MERGE_CONSECUTIVE_RANGES="YES",
+    CPL_VSIL_CURL_ALLOWED_EXTENSIONS=".vrt,.tif",
+)
+
+
+def dataset_filename(dataset_name: str) -> str:
+    return f"/vsis3/dataforgood-fb-data/hrsl-cogs/{dataset_name}/{dataset_name}-latest.vrt"
+
+
+NODATA_VALUE = 0.0
+
+
+def fetch_dataset(dataset_name: str, bounds: List[float]) -> Tuple[np.ndarray, rasterio.Affine]:
+    """read the window of the dataset covering `bounds`, returns the band and its transform"""
     print(f"Loading {dataset_name} dataset")
-    with rasterio.open(filename) as ds:
+    with rasterio.Env(**GDAL_ENV_OPTIONS), rasterio.open(dataset_filename(dataset_name)) as ds:
         window = rasterio.windows.from_bounds(*bounds, transform=ds.transform)
         window_transform = rasterio.windows.transform(window, ds.transform)
         band = ds.read(1, window=window)
 
-        if conversion_h3_res is None:
-            # determinate the h3 resolution to use
-            conversion_h3_res = h3ronpy.raster.nearest_h3_resolution(band.shape, window_transform)
-            print(f"Using h3 resolution {conversion_h3_res} for raster -> h3 conversion")
-
-        nodata_value = 0.0
-        band[np.isnan(band)] = nodata_value
-        df = h3ronpy.raster.raster_to_dataframe(band, window_transform, conversion_h3_res,
-                                                nodata_value=nodata_value,
-                                                compacted=False)
-        return df, conversion_h3_res
+    band[np.isnan(band)] = NODATA_VALUE
+    return band, window_transform
 
 
 def downsample_h3(h3index_series: pd.Series, h3_resolution: int) -> pd.Series:
-    return h3index_series.map(lambda i: h3.h3_to_parent(i, h3_resolution)).astype(np.uint64)
+    parents = h3vect.h3_to_parent(h3index_series.to_numpy(dtype=np.uint64), h3_resolution)
+    return pd.Series(parents, index=h3index_series.index, name=h3index_series.name)
 
 
 def assemble_dataframe(bounds: List[float], target_h3_res: int) -> pd.DataFrame:
-    df = pd.DataFrame({"h3index": []})
-    with rasterio.Env(AWS_NO_SIGN_REQUEST="YES"):
-        conversion_h3_res = None
-        for dataset_name, column_name, np_dtype in DATASETS:
-            col_df, conversion_h3_res = fetch_dataset(dataset_name, bounds, conversion_h3_res=conversion_h3_res)
-            if col_df.empty:
-                print(f"Dataset {dataset_name} was empty")
-                col_df = pd.DataFrame(
-                    {"h3index": np.array([], dtype=np.uint64), column_name: np.array([], dtype=np_dtype)})
-            else:
-                col_df.value = col_df.value.astype(np_dtype)
-                col_df.rename(columns={"value": column_name}, inplace=True)
-
-            if target_h3_res > conversion_h3_res:
-                raise ValueError(f"only h3 resolutions up to {conversion_h3_res}. up-scaling is not implemented")
-            elif target_h3_res < conversion_h3_res:
-                # scale down
-                col_df["h3index"] = downsample_h3(col_df["h3index"], target_h3_res)
-                col_df = col_df.groupby(by=["h3index"]).sum().reset_index()
-
-            if df.empty:
-                df = col_df
-            else:
-                df = df.merge(col_df, how="outer", on="h3index", copy=False)
-    return df
+    # the fetches are mostly waiting on S3, so they are run concurrently
+    with ThreadPoolExecutor(max_workers=len(DATASETS)) as executor:
+        fetched = list(executor.map(lambda dataset: fetch_dataset(dataset[0], bounds), DATASETS))
+
+    # all datasets share the same grid, so the resolution is derived from the first band
+    band, window_transform = fetched[0]
+    conversion_h3_res = h3ronpy.raster.nearest_h3_resolution(band.shape, window_transform)
+    print(f"Using h3 resolution {conversion_h3_res} for raster -> h3 conversion")
+    if target_h3_res > conversion_h3_res:
+        raise ValueError(f"only h3 resolutions up to {conversion_h3_res}. up-scaling is not implemented")
+
+    frames = []
+    for (dataset_name, column_name, np_dtype), (band, window_transform) in zip(DATASETS, fetched):
+        col_df = h3ronpy.raster.raster_to_dataframe(band, window_transform, conversion_h3_res,
+                                                    nodata_value=NODATA_VALUE,
+                                                    compacted=False)
+        if col_df.empty:
+            print(f"Dataset {dataset_name} was empty")
+            col_df = pd.DataFrame(
+                {"h3index": np.array([], dtype=np.uint64), column_name: np.array([], dtype=np_dtype)})
+        else:
+            # keep the h3index a uint64 column, so grouping and aligning happens on integer keys
+            col_df["h3index"] = col_df["h3index"].astype(np.uint64)
+            col_df.value = col_df.value.astype(np_dtype)
+            col_df.rename(columns={"value": column_name}, inplace=True)
+
+        if target_h3_res < conversion_h3_res:
+            # scale down using the multithreaded hash aggregation of arrow
+            col_table = pa.table({
+                "h3index": downsample_h3(col_df["h3index"], target_h3_res).to_numpy(),
+                column_name: col_df[column_name].to_numpy(),
+            })
+            col_df = col_table.group_by("h3index").aggregate([(column_name, "sum")]).to_pandas()
+            col_df = col_df.rename(columns={f"{column_name}_sum": column_name}).astype({column_name: np_dtype})
+
+        frames.append(col_df.set_index("h3index"))
+
+    # align all datasets on the h3index in a single pass instead of merging them one by one
+    return pd.concat(frames, axis=1, join="outer").reset_index()
 
 
 WGS84 = pyproj.CRS('EPSG:4326')
 SPHERICAL_MERCATOR = pyproj.CRS('EPSG:3857')  # uses meters as units
 
+# building a transformer is expensive, so these are created only once
+WGS84_TO_SPHERICAL_MERCATOR = pyproj.Transformer.from_crs(WGS84, SPHERICAL_MERCATOR, always_xy=True)
+SPHERICAL_MERCATOR_TO_WGS84 = pyproj.Transformer.from_crs(SPHERICAL_MERCATOR, WGS84, always_xy=True)
+
 
 def h3_buffer(geom, h3_resolution: int):
     """
     apply a slight buffering as the areas of h3 index hierarchies do not completely overlap
     """
-    sm_geom = shapely.ops.transform(pyproj.Transformer.from_proj(
-        WGS84, SPHERICAL_MERCATOR
-    ).transform, geom)
+    sm_geom = shapely.ops.transform(WGS84_TO_SPHERICAL_MERCATOR.transform, geom)
     buffered = sm_geom.buffer(h3.edge_length(h3_resolution, unit="m"))
-    return shapely.ops.transform(pyproj.Transformer.from_proj(
-        SPHERICAL_MERCATOR, WGS84
-    ).transform, buffered)
+    return shapely.ops.transform(SPHERICAL_MERCATOR_TO_WGS84.transform, buffered)
+
+
+def polyfill(geom, h3_resolution: int) -> np.ndarray:
+    """h3 cells covering the (multi-)polygon `geom`"""
+    cells = [h3.polyfill(mapping(polygon), h3_resolution, geo_json_conformant=True)
+             for polygon in getattr(geom, "geoms", [geom])]
+    return np.unique(np.concatenate(cells))
+
+
+def h3_cell_bounds(h3index) -> (float, float, float, float):
+    boundary = np.asarray(h3.h3_to_geo_boundary(h3index))  # (lat, lng) pairs
+    lat_min, lng_min = boundary.min(axis=0)
+    lat_max, lng_max = boundary.max(axis=0)
+    return lng_min, lat_min, lng_max, lat_max
 
 
 @click.command()
@@ -134,51 +168,53 @@ def cli(aoi_geojson_polygon_geometry_filename, out_dir, h3_res, group_h3_res, fg
     # avoid too many small fetches
     fetch_h3_res = min(group_h3_res, 3)
 
-    fetch_df = dataframe_to_geodataframe(
-        geodataframe_to_h3(gpd.GeoDataFrame({}, geometry=[h3_buffer(aoi_geom, fetch_h3_res)], crs=4326), fetch_h3_res)
-    )
-
-    if fetch_df.empty:
+    fetch_h3indexes = polyfill(h3_buffer(aoi_geom, fetch_h3_res), fetch_h3_res)
+    if len(fetch_h3indexes) == 0:
         return
 
     out_path = f"{str(out_dir)}/{group_h3_res}/{h3_res}"
     fs.create_dir(out_path, recursive=True)
 
-    for _, row in fetch_df.iterrows():
-        df = assemble_dataframe(row["geometry"].bounds, h3_res)
+    for fetch_h3index in fetch_h3indexes:
+        df = assemble_dataframe(h3_cell_bounds(fetch_h3index), h3_res)
 
         # remove over-fetched indexes
         df["fetch_h3index"] = downsample_h3(df["h3index"], fetch_h3_res)
-        filtered_df = df[df["fetch_h3index"] == row["h3index"]] \
+        filtered_df = df[df["fetch_h3index"] == fetch_h3index] \
             .drop(["fetch_h3index"], axis=1)
 
-        # create the groups
-        filtered_df["group_h3index"] = downsample_h3(filtered_df["h3index"], group_h3_res)
-
-        for group_h3index in h3.h3_to_children(row["h3index"], group_h3_res):
+        # create the groups. The rows get sorted by group, so each group is a contiguous slice of
+        # a single arrow table and the dataframe only needs to be converted once.
+        group_h3indexes = downsample_h3(filtered_df["h3index"], group_h3_res).to_numpy()
+        order = np.argsort(group_h3indexes, kind="stable")
+        group_h3indexes = group_h3indexes[order]
+        filtered_df = filtered_df.iloc[order]
+        table = pa.Table.from_pandas(filtered_df, preserve_index=False)
+
+        # most children are empty for sparse data, so their file contents are only serialized once
+        empty_arrow_file = pa.BufferOutputStream()
+        with pa.RecordBatchFileWriter(empty_arrow_file, table.schema):
+            pass
+        empty_arrow_file = empty_arrow_file.getvalue()
+
+        for group_h3index in h3.h3_to_children(fetch_h3index, group_h3_res):
             out_name = f"{out_path}/{h3.h3_to_string(group_h3index)}"
             print(f"creating {out_name}")
-            group_df = filtered_df[filtered_df["group_h3index"] == group_h3index] \
-                .drop(["group_h3index"], axis=1)
+            group_start = np.searchsorted(group_h3indexes, group_h3index, side="left")
+            group_end = np.searchsorted(group_h3indexes, group_h3index, side="right")
 
-            table = pa.Table.from_pandas(group_df, preserve_index=False)
             with fs.open_output_stream(f"{out_name}.arrow") as nativefile:
+                if group_end == group_start:
+                    nativefile.write(empty_arrow_file)
+                    continue
                 with pa.RecordBatchFileWriter(nativefile, table.schema) as writer:
-                    writer.write_table(table)
-
-            if fgb and not group_df.empty:
-                tf_name = None
-                try:
-                    tf_name = tempfile.mktemp(suffix=".fgb")
-                    geodf = dataframe_to_geodataframe(group_df, column_name="h3index")
-                    geodf.to_file(tf_name, driver="FlatGeobuf", layer="population")
-
-                    with fs.open_output_stream(f"{out_name}.fgb") as nativefile:
-                        nativefile.write(open(tf_name, mode='rb').read())
-                        nativefile.flush()
-                finally:
-                    if tf_name is not None:
-                        os.remove(tf_name)
+                    writer.write_table(table.slice(group_start, group_end - group_start))
+
+            if fgb and group_end > group_start:
+                group_df = filtered_df.iloc[group_start:group_end]
+                # out_path is on the local filesystem, so the file can be written in place
+                geodf = dataframe_to_geodataframe(group_df, column_name="h3index")
+                geodf.to_file(f"{out_name}.fgb", driver="FlatGeobuf", layer="population")
 
 
 if __name__ == '__main__':